@@ -4,6 +4,7 @@ from flask_bcrypt import Bcrypt
 from apscheduler.schedulers.background import BackgroundScheduler
 from flask_login import LoginManager
 import secrets
+from datetime import datetime
 from dotenv import load_dotenv
 import os
 
@@ -18,12 +19,12 @@ login_manager = LoginManager()
 scheduler = BackgroundScheduler()
 
 
-def create_app():
+def create_app(start_scheduler=True):
     app = Flask(__name__)
 
     # Configure database
     app.config['SECRET_KEY'] = secrets.token_hex(16)
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///techblog.db'
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///techblog.db')
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
     #uploads
@@ -32,6 +33,10 @@ def create_app():
     app.config["AVATAR_FOLDER"] = os.path.join(app.config["UPLOAD_FOLDER"], "avatars")
     app.config["POSTS_FOLDER"] = os.path.join(app.config["UPLOAD_FOLDER"], "posts")
 
+    # retention archives: <dir>/<table>/<YYYY-MM>.jsonl.gz (empty string disables archiving)
+    app.config["RETENTION_ARCHIVE_DIR"] = os.getenv(
+        "RETENTION_ARCHIVE_DIR", os.path.join(app.instance_path, "archive"))
+
     # Ensure folders exist
     os.makedirs(app.config["AVATAR_FOLDER"], exist_ok=True)
     os.makedirs(app.config["POSTS_FOLDER"], exist_ok=True)
@@ -53,15 +58,82 @@ def create_app():
     app.register_blueprint(auth)
     app.register_blueprint(admin)
 
-    # Schedule AI agent job here AFTER app is fully set up
-    from .ai_agent import update_trending_stories
-    # Import inside the function to avoid circular imports
+    # Fingerprinted/precompressed static assets (flask build-assets)
+    from .assets import init_assets
+    init_assets(app)
 
-    with app.app_context():
-        update_trending_stories()
+    # CLI maintenance commands (flask upgrade-db, ...)
+    from .commands import register_commands
+    register_commands(app)
 
-    scheduler.add_job(func=lambda:update_trending_stories(),
-                      trigger="interval", minutes=30)
-    scheduler.start()
+    # Background jobs (the ingestion worker and CLI tools pass start_scheduler=False;
+    # flask management commands never schedule, whatever they pass)
+    if start_scheduler and not _loaded_by_cli_command():
+        _schedule_jobs(app)
+        scheduler.start()
 
     return app
+
+
+def _loaded_by_cli_command():
+    """
+    True while the Flask CLI loads the app to run a management command
+    (flask export-data, flask shell, python -m app.cli ...), so those never
+    fetch news or run retention mid-export. `flask run` still schedules,
+    as do run.py and gunicorn, which run outside any click context.
+    """
+    import click
+
+    ctx = click.get_current_context(silent=True)
+    return ctx is not None and ctx.command.name != "run"
+
+
+def _schedule_jobs(app):
+    # Schedule AI agent job here AFTER app is fully set up
+    # (skipped when the async worker, python -m app.ingest, runs as its own process)
+    if os.getenv("EXTERNAL_INGEST_WORKER") != "1":
+        from .ai_agent import update_trending_stories
+        # Import inside the function to avoid circular imports
+
+        with app.app_context():
+            update_trending_stories()
+
+        scheduler.add_job(func=lambda:update_trending_stories(),
+                          trigger="interval", minutes=30)
+
+    # Decay "hot" scores so old likes stop dominating the Hot tab
+    from .hot import decay_hot_scores
+
+    def _decay_hot_scores():
+        with app.app_context():
+            decay_hot_scores()
+
+    scheduler.add_job(func=_decay_hot_scores, trigger="interval", minutes=15)
+
+    # Related posts for newly published posts, off the request path
+    from .related import index_pending
+
+    def _index_pending():
+        with app.app_context():
+            index_pending()
+
+    scheduler.add_job(func=_index_pending, trigger="interval", minutes=1)
+
+    # Retention: expire old trending stories (and likes, if configured) in small batches
+    from .retention import apply_retention
+
+    def _apply_retention():
+        with app.app_context():
+            apply_retention()
+
+    scheduler.add_job(func=_apply_retention, trigger="interval", minutes=60)
+
+    # Autocomplete prefix index: built in the background right away, then hourly
+    from .suggest import rebuild_suggest_index
+
+    def _rebuild_suggest_index():
+        with app.app_context():
+            rebuild_suggest_index()
+
+    scheduler.add_job(func=_rebuild_suggest_index, trigger="interval", minutes=60,
+                      next_run_time=datetime.now())
@@ -2,6 +2,10 @@ from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import current_user, login_required
 from app.models import User, Post
 from app import db
+from app.queries import admin_post_options, admin_user_options
+from app.categories import adjust_post_count
+from app.related import forget_post
+from app.suggest import remove_post as remove_post_suggestion, remove_user as remove_user_suggestion
 
 admin = Blueprint('admin', __name__, url_prefix='/admin')
 
@@ -33,7 +37,7 @@ def dashboard():
 @admin_required
 def users():
     q = request.args.get('q', '').strip()
-    query = User.query
+    query = User.query.options(*admin_user_options())
     if q:
         query = query.filter((User.username.ilike(
             f'%{q}%')) | (User.email.ilike(f'%{q}%')))
@@ -61,8 +65,10 @@ def delete_user(user_id):
     if user.id == current_user.id:
         flash("You cannot delete yourself.", "warning")
         return redirect(url_for('admin.users'))
+    username = user.username
     db.session.delete(user)
     db.session.commit()
+    remove_user_suggestion(username)
     flash("User deleted.", "success")
     return redirect(url_for('admin.users'))
 
@@ -71,7 +77,7 @@ def delete_user(user_id):
 @admin_required
 def posts():
     status = request.args.get('status', 'all')
-    query = Post.query
+    query = Post.query.options(*admin_post_options())
     if status != 'all':
         query = query.filter_by(status=status)
     posts = query.order_by(Post.date_posted.desc()).all()
@@ -82,8 +88,11 @@ def posts():
 @admin_required
 def delete_post(post_id):
     post = Post.query.get_or_404(post_id)
+    adjust_post_count(post.category_id, -1)
+    forget_post(post.id)
     db.session.delete(post)
     db.session.commit()
+    remove_post_suggestion(post_id)
     flash("Post deleted.", "success")
     return redirect(url_for('admin.posts'))
 
@@ -92,17 +92,11 @@ def _matches_topic(title: str, description: str) -> bool:
 # Fetch trending computer/tech news
 # -------------------------------
 
-def fetch_trending_news():
-    """
-    Fetch fresh computer/tech focused stories (AI, programming, security, hardware).
-    Uses NewsAPI 'everything' endpoint, restricted to tech domains, newest first.
-    """
-    if not NEWS_API_KEY:
-        logger.error("NEWS_API_KEY is not set. Skipping fetch.")
-        return []
+NEWSAPI_URL = "https://newsapi.org/v2/everything"
+
 
-    url = "https://newsapi.org/v2/everything"
-    params = {
+def newsapi_params() -> dict:
+    return {
         # broad query to include common computer-tech terms
         "q": "AI OR computer OR programming OR cybersecurity OR GPU OR CPU OR chip OR 'game development'",
         "language": "en",
@@ -112,18 +106,13 @@ def fetch_trending_news():
         "apiKey": NEWS_API_KEY,
     }
 
-    try:
-        resp = _session.get(url, params=params, timeout=15)
-    except Exception as e:
-        logger.error("Error calling NewsAPI: %s", e)
-        return []
-
-    if resp.status_code != 200:
-        logger.error("NewsAPI error (%s): %s", resp.status_code, resp.text[:300])
-        return []
 
-    payload = resp.json() or {}
-    articles = payload.get("articles", [])
+def parse_articles(payload: dict) -> list:
+    """
+    Turns a NewsAPI-style payload ({"articles": [...]}) into story dicts,
+    dropping incomplete and off-topic items.
+    """
+    articles = (payload or {}).get("articles", [])
     stories = []
 
     for a in articles:
@@ -146,6 +135,29 @@ def fetch_trending_news():
             "source_url": source_url,
         })
 
+    return stories
+
+
+def fetch_trending_news():
+    """
+    Fetch fresh computer/tech focused stories (AI, programming, security, hardware).
+    Uses NewsAPI 'everything' endpoint, restricted to tech domains, newest first.
+    """
+    if not NEWS_API_KEY:
+        logger.error("NEWS_API_KEY is not set. Skipping fetch.")
+        return []
+
+    try:
+        resp = _session.get(NEWSAPI_URL, params=newsapi_params(), timeout=15)
+    except Exception as e:
+        logger.error("Error calling NewsAPI: %s", e)
+        return []
+
+    if resp.status_code != 200:
+        logger.error("NewsAPI error (%s): %s", resp.status_code, resp.text[:300])
+        return []
+
+    stories = parse_articles(resp.json())
     logger.info("Fetched %d candidate stories from NewsAPI.", len(stories))
     return stories
 
@@ -162,11 +174,7 @@ def generate_summary(text: str) -> str:
     if not text:
         return "No description available."
 
-    prompt = (
-        "Summarize this computer/tech news item in 2–3 punchy sentences. "
-        "Be clear, engaging, and avoid hypey buzzwords:\n\n"
-        f"{text}"
-    )
+    prompt = summary_prompt(text)
 
     # New client
     if _openai_client is not None:
@@ -194,7 +202,24 @@ def generate_summary(text: str) -> str:
         except Exception as e:
             logger.warning("OpenAI (legacy client) failed: %s", e)
 
-    # Fallback
+    return fallback_summary(text)
+
+
+def summary_prompt(text: str) -> str:
+    return (
+        "Summarize this computer/tech news item in 2–3 punchy sentences. "
+        "Be clear, engaging, and avoid hypey buzzwords:\n\n"
+        f"{text}"
+    )
+
+
+def fallback_summary(text: str) -> str:
+    """
+    Truncated text, used when no AI client is available.
+    """
+    text = (text or "").strip()
+    if not text:
+        return "No description available."
     return (text[:400] + "…") if len(text) > 400 else text
 
 # ---------------------------------------------
@@ -206,7 +231,6 @@ def update_trending_stories():
     Pulls fresh tech stories and updates DB.
     - Avoids duplicates by checking source_url (better than title).
     - Summarizes with OpenAI if available.
-    - Keeps table from growing unbounded (optional trimming).
     """
     stories = fetch_trending_news()
     if not stories:
@@ -239,30 +263,4 @@ def update_trending_stories():
         return
 
     logger.info("%d new trending stories added.", new_count)
-
-    # (Optional) Trim to last N stories to keep DB lean
-    _trim_trending(keep_last=200)
-
-def _trim_trending(keep_last: int = 200):
-    """
-    Keep only the most recent `keep_last` stories.
-    """
-    try:
-        total = TrendingStory.query.count()
-        if total > keep_last:
-            cutoff = total - keep_last
-            # Oldest first
-            old_ids = (
-                db.session.query(TrendingStory.id)
-                .order_by(TrendingStory.date_posted.asc())
-                .limit(cutoff)
-                .all()
-            )
-            old_ids = [i for (i,) in old_ids]
-            if old_ids:
-                TrendingStory.query.filter(TrendingStory.id.in_(old_ids)).delete(synchronize_session=False)
-                db.session.commit()
-                logger.info("Trimmed %d old trending stories.", len(old_ids))
-    except Exception as e:
-        db.session.rollback()
-        logger.warning("Trimming failed (ignored): %s", e)
+    # old stories are expired by the retention job (app/retention.py)
@@ -0,0 +1,204 @@
+import os
+import gzip
+import json
+import time
+import shutil
+import hashlib
+import logging
+import mimetypes
+
+from flask import request, send_from_directory
+
+logger = logging.getLogger(__name__)
+
+# brotli is optional; without it only .gz siblings are emitted/served
+brotli = None
+try:
+    import brotli  # type: ignore
+except Exception:
+    brotli = None
+
+DIST_DIR = "dist"                  # inside the static folder
+MANIFEST = "manifest.json"
+SKIP_DIRS = {"uploads", DIST_DIR}  # user uploads aren't build assets
+COMPRESSIBLE = {".css", ".js", ".svg", ".json", ".txt", ".html", ".xml", ".ico", ".map"}
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# (suffix, Content-Encoding), best first
+_ENCODINGS = [(".br", "br"), (".gz", "gzip")]
+
+
+def _digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(64 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()[:12]
+
+
+def _fingerprinted(rel_path: str, digest: str) -> str:
+    """
+    "css/style.css" -> "css/style.3f2a9c0d1b4e.css"
+    """
+    root, ext = os.path.splitext(rel_path)
+    return f"{root}.{digest}{ext}"
+
+
+def _precompress(path: str) -> list:
+    """
+    Writes .gz (and .br when available) next to `path` if they are smaller.
+    Returns the suffixes written.
+    """
+    with open(path, "rb") as fh:
+        data = fh.read()
+    written = []
+    candidates = [(".gz", lambda d: gzip.compress(d, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        candidates.insert(0, (".br", lambda d: brotli.compress(d, quality=11)))
+    for suffix, compress in candidates:
+        packed = compress(data)
+        if len(packed) < len(data) * 0.9:
+            with open(path + suffix + ".tmp", "wb") as fh:
+                fh.write(packed)
+            os.replace(path + suffix + ".tmp", path + suffix)
+            written.append(suffix)
+    return written
+
+
+def build_assets(static_folder: str) -> dict:
+    """
+    Copies every static asset (uploads excluded) to static/dist/ under a
+    content-hashed name, emits precompressed siblings for text assets and
+    writes dist/manifest.json mapping "css/style.css" -> "dist/css/style.<hash>.css".
+
+    Earlier builds are left in place: running servers keep serving the
+    manifest they loaded, and cached pages keep pointing at old
+    fingerprints, so those files must survive (see prune_assets). The
+    manifest is replaced atomically.
+    """
+    dist = os.path.join(static_folder, DIST_DIR)
+    os.makedirs(dist, exist_ok=True)
+
+    manifest = {}
+    for root, dirs, files in os.walk(static_folder):
+        if os.path.relpath(root, static_folder) == ".":
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for name in sorted(files):
+            source = os.path.join(root, name)
+            rel_path = os.path.relpath(source, static_folder).replace(os.sep, "/")
+            target_rel = _fingerprinted(rel_path, _digest(source))
+            target = os.path.join(dist, target_rel)
+            if not os.path.exists(target):   # same name == same content
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copyfile(source, target + ".tmp")
+                os.replace(target + ".tmp", target)
+                if os.path.splitext(name)[1].lower() in COMPRESSIBLE:
+                    _precompress(target)
+            manifest[rel_path] = f"{DIST_DIR}/{target_rel}"
+
+    path = os.path.join(dist, MANIFEST)
+    with open(path + ".tmp", "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+    logger.info("Built %d static assets into %s.", len(manifest), dist)
+    return manifest
+
+
+def prune_assets(static_folder: str, older_than_days: float = 7) -> int:
+    """
+    Deletes fingerprinted files (and their .br/.gz) that the current manifest
+    no longer references and that were built more than `older_than_days`
+    ago, i.e. once pages that could still link to them have aged out.
+    Returns files removed.
+    """
+    dist = os.path.join(static_folder, DIST_DIR)
+    current = set(load_manifest(static_folder).values())
+    if not current:
+        return 0
+    cutoff = time.time() - older_than_days * 24 * 3600
+    removed = 0
+    for root, _, files in os.walk(dist):
+        for name in files:
+            path = os.path.join(root, name)
+            rel_path = os.path.relpath(path, static_folder).replace(os.sep, "/")
+            if rel_path == f"{DIST_DIR}/{MANIFEST}":
+                continue
+            for suffix, _ in _ENCODINGS:
+                if rel_path.endswith(suffix):
+                    rel_path = rel_path[:-len(suffix)]
+            if rel_path not in current and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+    logger.info("Pruned %d old static assets from %s.", removed, dist)
+    return removed
+
+
+def load_manifest(static_folder: str) -> dict:
+    path = os.path.join(static_folder, DIST_DIR, MANIFEST)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def _accepts(encoding: str) -> bool:
+    """
+    Accept-Encoding check that honours q=0; an explicit token wins over "*"
+    ("*;q=0, br" accepts br).
+    """
+    qualities = {}
+    for part in request.headers.get("Accept-Encoding", "").split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = params.strip()
+        try:
+            qualities[token] = float(q[2:]) if q.startswith("q=") else 1.0
+        except ValueError:
+            qualities[token] = 0.0
+    if encoding in qualities:
+        return qualities[encoding] > 0
+    return qualities.get("*", 0.0) > 0
+
+
+def init_assets(app):
+    """
+    Loads the manifest once at startup. When present, url_for('static', ...)
+    resolves to fingerprinted names and those are served with far-future
+    immutable caching plus br/gzip negotiation. Without a build nothing changes.
+    """
+    manifest = load_manifest(app.static_folder)
+    app.config["ASSET_MANIFEST"] = manifest
+    if not manifest:
+        return
+
+    @app.url_defaults
+    def _fingerprint_static(endpoint, values):
+        if endpoint == "static" and values.get("filename") in manifest:
+            values["filename"] = manifest[values["filename"]]
+
+    default_static = app.view_functions["static"]
+
+    def static(filename):
+        if not filename.startswith(DIST_DIR + "/"):
+            return default_static(filename=filename)
+
+        mimetype, _ = mimetypes.guess_type(filename)
+        chosen, encoding = filename, None
+        for suffix, name in _ENCODINGS:
+            if os.path.exists(os.path.join(app.static_folder, filename + suffix)) and _accepts(name):
+                chosen, encoding = filename + suffix, name
+                break
+
+        response = send_from_directory(app.static_folder, chosen,
+                                       mimetype=mimetype or "application/octet-stream",
+                                       max_age=IMMUTABLE_MAX_AGE)
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        response.vary.add("Accept-Encoding")
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        return response
+
+    app.view_functions["static"] = static
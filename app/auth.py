@@ -2,6 +2,7 @@ from . import login_manager
 from flask import Blueprint, render_template, redirect, url_for, request, flash
 from flask_login import login_user, logout_user, login_required, current_user
 from .models import db, User
+from .suggest import add_user as add_user_suggestion
 
 
 auth = Blueprint("auth", __name__)
@@ -31,6 +32,7 @@ def register():
 
         db.session.add(user)
         db.session.commit()
+        add_user_suggestion(user)
         flash("Account created successfully! Please Log in.", "success")
         return redirect(url_for('auth.login'))
 
@@ -0,0 +1,183 @@
+import re
+import uuid
+import unicodedata
+
+from .models import Category, Post, db
+
+# Categories offered on the home page filter bar / create form.
+DEFAULT_CATEGORIES = [
+    ("General", "📰"),
+    ("Computing & Hardware", "🖥️"),
+    ("Artificial Intelligence", "🤖"),
+    ("Cybersecurity & Hacks", "🔐"),
+    ("Mobile & Gadgets", "📱"),
+    ("Tech Innovations", "🚀"),
+    ("Videos", "🎥"),
+]
+
+DEFAULT_CATEGORY = "General"
+
+
+# symbols that tell categories apart ("C", "C#", "C++") and would otherwise be dropped
+_SLUG_SYMBOLS = {"+": " plus ", "#": " sharp "}
+
+
+def slugify(name: str) -> str:
+    """
+    "Computing & Hardware" -> "computing-hardware", "C++" -> "c-plus-plus".
+    Accents are transliterated ("Café" -> "cafe"); names with no ASCII
+    letters or digits at all give "" (see _unique_slug for the fallback).
+    """
+    text = unicodedata.normalize("NFKD", name or "")
+    text = "".join(_SLUG_SYMBOLS.get(ch, ch) for ch in text)
+    text = text.encode("ascii", "ignore").decode("ascii").lower()
+    return re.sub(r"[^a-z0-9]+", "-", text).strip("-")
+
+
+def normalize_name(name: str) -> str:
+    """
+    Collapse whitespace so "  Tech   Innovations " and "Tech Innovations" are one category.
+    """
+    return " ".join((name or "").split())
+
+
+def _find_by_name(name: str):
+    """
+    Case-insensitive name match ("ai" == "AI"), done in Python so non-ASCII
+    names compare correctly too; the category table is small.
+    """
+    key = normalize_name(name).casefold()
+    if not key:
+        return None
+    for category in Category.query.all():
+        if normalize_name(category.name).casefold() == key:
+            return category
+    return None
+
+
+def get_category(slug_or_name: str):
+    """
+    Looks a category up by its slug, then by name. Returns None if unknown.
+    """
+    value = (slug_or_name or "").strip()
+    if not value:
+        return None
+    return Category.query.filter_by(slug=value).first() or _find_by_name(value)
+
+
+def _unique_slug(base: str) -> str:
+    """
+    `base`, suffixed ("c-2", "c-3", ...) when another category already has it.
+    """
+    slug, n = base, 2
+    while Category.query.filter_by(slug=slug).first() is not None:
+        slug, n = f"{base}-{n}", n + 1
+    return slug
+
+
+def get_or_create_category(name: str, icon: str = None) -> Category:
+    """
+    Returns the category named `name` (case-insensitively), creating it if
+    needed. Distinct names always get distinct slugs; a name with nothing
+    to slugify ("Программирование", emoji) gets "category-<id>".
+    The new row is added to the session but not committed.
+    """
+    name = normalize_name(name) or DEFAULT_CATEGORY
+    category = _find_by_name(name)
+    if category is None:
+        base = slugify(name)
+        # placeholder keeps the unique slug column valid until the id is known
+        slug = _unique_slug(base) if base else f"new-{uuid.uuid4().hex}"
+        category = Category(name=name, slug=slug, icon=icon, post_count=0)
+        db.session.add(category)
+        db.session.flush()
+        if not base:
+            category.slug = _unique_slug(f"category-{category.id}")
+            db.session.flush()
+    return category
+
+
+def ensure_default_categories():
+    for name, icon in DEFAULT_CATEGORIES:
+        category = get_or_create_category(name, icon=icon)
+        if not category.icon:
+            category.icon = icon
+
+
+def nav_categories():
+    """
+    Categories for the filter bar, with their maintained post counts (single query).
+    """
+    return Category.query.order_by(Category.name.asc()).all()
+
+
+def adjust_post_count(category_id, delta: int):
+    """
+    Atomically bumps a category's post_count inside the current transaction.
+    """
+    if category_id is None:
+        return
+    Category.query.filter_by(id=category_id).update(
+        {Category.post_count: Category.post_count + delta},
+        synchronize_session=False,
+    )
+
+
+def assign_category(post: Post, category: Category):
+    """
+    Moves `post` into `category`, keeping the denormalized name and counts in sync.
+    """
+    if post.category_id == category.id:
+        post.category = category.name
+        return
+    adjust_post_count(post.category_id, -1)
+    post.category_id = category.id
+    post.category = category.name
+    adjust_post_count(category.id, +1)
+
+
+def recount_posts():
+    """
+    Rebuilds every post_count from the post table with one GROUP BY.
+    """
+    counts = dict(
+        db.session.query(Post.category_id, db.func.count(Post.id))
+        .group_by(Post.category_id)
+        .all()
+    )
+    for category in Category.query.all():
+        category.post_count = counts.get(category.id, 0)
+
+
+def normalize_post_categories() -> int:
+    """
+    Maps every post's free-text `category` onto a Category row and sets category_id.
+    Matching is by whitespace-normalized, case-insensitive name, so "ai " / "AI"
+    collapse together while "C", "C#" and "C++" stay apart. Returns posts updated.
+    """
+    ensure_default_categories()
+    for category in Category.query.filter(Category.slug == "").all():   # pre-fix rows
+        category.slug = _unique_slug(f"category-{category.id}")
+    db.session.flush()
+
+    updated = 0
+    distinct = [c for (c,) in db.session.query(Post.category).distinct().all()]
+    for raw in distinct:
+        category = get_or_create_category(raw or DEFAULT_CATEGORY)
+        updated += (
+            Post.query.filter(Post.category == raw)
+            .update(
+                {Post.category_id: category.id, Post.category: category.name},
+                synchronize_session=False,
+            )
+        )
+
+    # rows with a NULL category string
+    general = get_or_create_category(DEFAULT_CATEGORY)
+    updated += Post.query.filter(Post.category.is_(None)).update(
+        {Post.category_id: general.id, Post.category: general.name},
+        synchronize_session=False,
+    )
+
+    recount_posts()
+    return updated
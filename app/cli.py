@@ -0,0 +1,16 @@
+"""
+Maintenance CLI that never starts the scheduler or fetches news:
+
+    python -m app.cli export-data backups/2025-10-01
+    python -m app.cli import-data backups/2025-10-01 --resume
+    python -m app.cli upgrade-db
+"""
+from flask.cli import FlaskGroup
+
+from . import create_app
+
+cli = FlaskGroup(create_app=lambda: create_app(start_scheduler=False))
+
+
+if __name__ == "__main__":
+    cli()
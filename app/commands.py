@@ -0,0 +1,101 @@
+import click
+
+
+def register_commands(app):
+    """
+    Attach the maintenance commands to `flask ...`.
+    """
+
+    @app.cli.command("upgrade-db")
+    def upgrade_db():
+        """Create new tables/columns and backfill data for existing databases."""
+        from .migrations import upgrade
+
+        upgrade()
+        click.echo("✅ Database upgraded.")
+
+    @app.cli.command("rebuild-related")
+    @click.option("--top-k", default=5, show_default=True, help="Neighbours stored per post.")
+    def rebuild_related_cmd(top_k):
+        """Recompute every post's related-posts list from scratch."""
+        from .related import rebuild_related
+
+        count = rebuild_related(k=top_k)
+        click.echo(f"✅ Related posts rebuilt for {count} posts.")
+
+    @app.cli.command("render-posts")
+    @click.option("--all", "render_all", is_flag=True, help="Re-render every post, not just missing ones.")
+    def render_posts_cmd(render_all):
+        """Backfill stored HTML, excerpts and reading times."""
+        from .rendering import backfill_rendered
+
+        count = backfill_rendered(only_missing=not render_all)
+        click.echo(f"✅ Rendered {count} posts.")
+
+    def _progress(label):
+        def report(table, done, total):
+            suffix = f"/{total}" if total is not None else ""
+            click.echo(f"  {label} {table}: {done}{suffix}")
+        return report
+
+    @app.cli.command("export-data")
+    @click.argument("directory", type=click.Path(file_okay=False))
+    @click.option("--table", "tables", multiple=True, help="Only these tables (repeatable).")
+    @click.option("--batch-size", default=1000, show_default=True)
+    def export_data(directory, tables, batch_size):
+        """Stream tables to gzip-compressed JSONL files in DIRECTORY."""
+        from .transfer import export_tables
+
+        try:
+            counts = export_tables(directory, tables, batch_size, progress=_progress("exported"))
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--table")
+        click.echo(f"✅ Exported {sum(counts.values())} rows from {len(counts)} tables to {directory}.")
+
+    @app.cli.command("import-data")
+    @click.argument("directory", type=click.Path(exists=True, file_okay=False))
+    @click.option("--table", "tables", multiple=True, help="Only these tables (repeatable).")
+    @click.option("--batch-size", default=1000, show_default=True)
+    @click.option("--resume", is_flag=True, help="Continue an interrupted import; rows already present are skipped.")
+    def import_data(directory, tables, batch_size, resume):
+        """Load an export-data DIRECTORY into the configured database."""
+        from .transfer import import_tables
+
+        try:
+            counts = import_tables(directory, tables, batch_size, resume=resume,
+                                   progress=_progress("imported"))
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--table")
+        except RuntimeError as e:
+            raise click.ClickException(str(e))
+        click.echo(f"✅ Imported {sum(counts.values())} rows into {len(counts)} tables.")
+
+    @app.cli.command("apply-retention")
+    @click.option("--archive-dir", type=click.Path(file_okay=False), default=None,
+                  help="Override RETENTION_ARCHIVE_DIR.")
+    def apply_retention_cmd(archive_dir):
+        """Expire (and archive) old trending stories and likes now."""
+        from .retention import apply_retention
+
+        results = apply_retention(archive_dir=archive_dir)
+        for table, removed in results.items():
+            click.echo(f"  {table}: {removed} rows removed")
+        click.echo("✅ Retention applied.")
+
+    @app.cli.command("build-assets")
+    def build_assets_cmd():
+        """Fingerprint and precompress static assets into static/dist/."""
+        from .assets import build_assets
+
+        manifest = build_assets(app.static_folder)
+        click.echo(f"✅ Built {len(manifest)} assets; restart the app to load the manifest.")
+
+    @app.cli.command("prune-assets")
+    @click.option("--days", default=7.0, show_default=True,
+                  help="Keep superseded builds younger than this.")
+    def prune_assets_cmd(days):
+        """Delete superseded fingerprinted assets from static/dist/."""
+        from .assets import prune_assets
+
+        removed = prune_assets(app.static_folder, older_than_days=days)
+        click.echo(f"✅ Removed {removed} old asset files.")
@@ -0,0 +1,209 @@
+import os
+import logging
+from datetime import datetime
+
+import numpy as np
+
+from .models import Post, Like, db
+from .queries import feed_options
+
+logger = logging.getLogger(__name__)
+
+# A like is worth 1.0 when given and half as much after HOT_HALF_LIFE_HOURS.
+HOT_HALF_LIFE_HOURS = float(os.getenv("HOT_HALF_LIFE_HOURS", "24"))
+HOT_FEED_SIZE = 50
+
+# Scores that decay below this are flushed to 0 and skipped by the decay job.
+_EPSILON = 1e-3
+_HALF_LIFE_SECONDS = HOT_HALF_LIFE_HOURS * 3600.0
+# Stands in for a NULL hot_updated_at in the decay job's guard.
+_NEVER = datetime(1970, 1, 1)
+
+
+def _decay_factor(seconds):
+    """
+    0.5 ** (elapsed / half_life); works on floats and NumPy arrays.
+    """
+    return np.power(0.5, np.maximum(seconds, 0.0) / _HALF_LIFE_SECONDS)
+
+
+def like_weight(liked_at: datetime, now: datetime = None) -> float:
+    """
+    What a single like given at `liked_at` contributes to the score at `now`.
+    """
+    now = now or datetime.utcnow()
+    return float(_decay_factor((now - (liked_at or now)).total_seconds()))
+
+
+def _decayed(factor, weight=0.0):
+    """
+    SQL for hot_score * factor + weight, flushed to 0 below _EPSILON.
+    Evaluated by the database so it always applies to the committed score.
+    """
+    value = Post.hot_score * factor + weight
+    return db.case((value > _EPSILON, value), else_=0.0)
+
+
+def record_like(post_id: int, liked_at: datetime, liked: bool, retries: int = 5):
+    """
+    Incrementally updates a post's hot_score for one like/unlike:
+    the stored score is decayed to now, then the like's weight is added
+    (or, for an unlike, its current decayed weight removed).
+
+    Runs as UPDATE ... SET hot_score = hot_score * :f + :w guarded by the
+    hot_updated_at the decay factor was computed from, so a concurrent
+    like or decay pass makes the guard miss and we re-read and retry
+    instead of losing an update. Caller commits.
+    """
+    for _ in range(retries):
+        seen = db.session.query(Post.hot_updated_at).filter(Post.id == post_id).scalar()
+        now = datetime.utcnow()
+        factor = float(_decay_factor((now - (seen or now)).total_seconds()))
+        weight = like_weight(liked_at, now)
+
+        guard = Post.hot_updated_at.is_(None) if seen is None else Post.hot_updated_at == seen
+        updated = Post.query.filter(Post.id == post_id, guard).update(
+            {Post.hot_score: _decayed(factor, weight if liked else -weight),
+             Post.hot_updated_at: now},
+            synchronize_session=False,
+        )
+        if updated:
+            return
+    logger.warning("Hot score update for post %s lost the race %d times; skipped.", post_id, retries)
+
+
+def hot_posts(limit: int = HOT_FEED_SIZE):
+    """
+    Hot feed: an index read of ix_post_hot, newest first among ties.
+    """
+    return (
+        Post.query.options(*feed_options())
+        .order_by(Post.hot_score.desc(), Post.date_posted.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def _decay_rows(rows, now: datetime) -> list:
+    """
+    Decays one batch of (id, hot_updated_at) rows with a single executemany.
+    Each row's UPDATE only applies if hot_updated_at is still what we read;
+    returns the ids still behind `now` afterwards, i.e. whose guard missed
+    on an older write. Rows a like moved past `now` are already current and
+    are left alone (rewriting them would move hot_updated_at backwards).
+    """
+    ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+    elapsed = np.fromiter(
+        ((now - (r[1] or now)).total_seconds() for r in rows),
+        dtype=np.float64,
+        count=len(rows),
+    )
+    factors = _decay_factor(elapsed)
+
+    table = Post.__table__
+    stmt = (
+        table.update()
+        .where(table.c.id == db.bindparam("b_id"))
+        .where(db.func.coalesce(table.c.hot_updated_at, _NEVER) == db.bindparam("b_seen"))
+        .values(hot_score=_decayed(db.bindparam("b_factor")), hot_updated_at=now)
+    )
+    db.session.execute(stmt, [
+        {"b_id": int(i), "b_seen": r[1] or _NEVER, "b_factor": float(f)}
+        for i, r, f in zip(ids, rows, factors)
+    ])
+    db.session.commit()
+
+    missed = (
+        db.session.query(Post.id)
+        .filter(Post.id.in_([int(i) for i in ids]),
+                (Post.hot_updated_at < now) | Post.hot_updated_at.is_(None))
+        .all()
+    )
+    return [i for (i,) in missed]
+
+
+def decay_hot_scores(batch_size: int = 1000, retries: int = 3) -> int:
+    """
+    Periodic job: decays every non-zero hot_score to now.
+    Walks posts in primary-key batches, computes the decay factors with
+    NumPy and applies them in SQL (hot_score = hot_score * :f) with one
+    executemany per batch, committing per batch so writers are never
+    blocked for long. Rows changed by a like between our read and write
+    are re-read and retried. Returns rows updated.
+    """
+    now = datetime.utcnow()
+    last_id = 0
+    updated = 0
+
+    while True:
+        rows = (
+            db.session.query(Post.id, Post.hot_updated_at)
+            .filter(Post.id > last_id, Post.hot_score > 0)
+            .order_by(Post.id.asc())
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        updated += len(rows)
+
+        missed = _decay_rows(rows, now)
+        for _ in range(retries):
+            if not missed:
+                break
+            rows = (
+                db.session.query(Post.id, Post.hot_updated_at)
+                .filter(Post.id.in_(missed), Post.hot_score > 0)
+                .all()
+            )
+            missed = _decay_rows(rows, now) if rows else []
+        if missed:
+            logger.warning("Hot score decay skipped %d contended posts.", len(missed))
+
+    logger.info("Decayed hot scores on %d posts.", updated)
+    return updated
+
+
+def rebuild_hot_scores(batch_size: int = 5000) -> int:
+    """
+    Recomputes every hot_score from the Like table (used by upgrade-db).
+    Likes are streamed in batches and summed per post with np.add.at.
+    """
+    now = datetime.utcnow()
+    max_id = db.session.query(db.func.max(Post.id)).scalar() or 0
+    totals = np.zeros(max_id + 1, dtype=np.float64)
+
+    last_id = 0
+    while True:
+        rows = (
+            db.session.query(Like.id, Like.post_id, Like.created_at)
+            .filter(Like.id > last_id)
+            .order_by(Like.id.asc())
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        post_ids = np.fromiter((r[1] for r in rows), dtype=np.int64, count=len(rows))
+        elapsed = np.fromiter(
+            ((now - (r[2] or now)).total_seconds() for r in rows),
+            dtype=np.float64,
+            count=len(rows),
+        )
+        keep = post_ids <= max_id
+        np.add.at(totals, post_ids[keep], _decay_factor(elapsed[keep]))
+
+    totals[totals < _EPSILON] = 0.0
+    post_ids = [pid for (pid,) in db.session.query(Post.id).all()]
+    for start in range(0, len(post_ids), batch_size):
+        chunk = post_ids[start:start + batch_size]
+        db.session.execute(
+            db.update(Post),
+            [{"id": pid, "hot_score": float(totals[pid]), "hot_updated_at": now} for pid in chunk],
+        )
+        db.session.commit()
+
+    return len(post_ids)
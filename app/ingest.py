@@ -0,0 +1,281 @@
+"""
+Async ingestion worker: polls news sources concurrently, summarizes new
+stories and writes them to TrendingStory in bulk.
+
+Run it as its own process (and set EXTERNAL_INGEST_WORKER=1 for the web
+process so it stops fetching in its scheduler thread):
+
+    python -m app.ingest            # poll forever
+    python -m app.ingest --once     # single cycle
+"""
+import os
+import sys
+import signal
+import asyncio
+import logging
+from datetime import datetime
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+import httpx
+
+from .ai_agent import (NEWS_API_KEY, NEWSAPI_URL, OPENAI_API_KEY, OPENAI_MODEL,
+                       newsapi_params, parse_articles, summary_prompt, fallback_summary)
+
+logger = logging.getLogger(__name__)
+
+# -----------------------
+# Configuration
+# -----------------------
+
+INGEST_INTERVAL_MINUTES = float(os.getenv("INGEST_INTERVAL_MINUTES", "30"))
+INGEST_CYCLE_DEADLINE = float(os.getenv("INGEST_CYCLE_DEADLINE", "120"))   # seconds per cycle
+INGEST_PER_HOST_LIMIT = int(os.getenv("INGEST_PER_HOST_LIMIT", "4"))
+INGEST_SUMMARY_CONCURRENCY = int(os.getenv("INGEST_SUMMARY_CONCURRENCY", "4"))
+# extra NewsAPI-compatible JSON endpoints ({"articles": [...]}), comma-separated
+INGEST_FEED_URLS = os.getenv("INGEST_FEED_URLS", "")
+
+HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+HTTP_TIMEOUT = httpx.Timeout(15.0, connect=5.0)
+
+_AsyncOpenAI = None
+try:
+    from openai import AsyncOpenAI as _AsyncOpenAI  # type: ignore
+except Exception:
+    pass
+
+
+@dataclass
+class NewsSource:
+    name: str
+    url: str
+    params: dict = field(default_factory=dict)
+
+
+def default_sources() -> list:
+    sources = []
+    if NEWS_API_KEY:
+        sources.append(NewsSource("newsapi", NEWSAPI_URL, newsapi_params()))
+    for url in filter(None, (u.strip() for u in INGEST_FEED_URLS.split(","))):
+        sources.append(NewsSource(urlsplit(url).netloc or url, url))
+    return sources
+
+
+class HostLimiter:
+    """
+    One semaphore per host so a slow source can't take the whole pool.
+    """
+
+    def __init__(self, per_host: int = INGEST_PER_HOST_LIMIT):
+        self.per_host = per_host
+        self._semaphores = {}
+
+    def __call__(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.per_host)
+        return self._semaphores[host]
+
+
+# -----------------------
+# Fetch + summarize
+# -----------------------
+
+async def fetch_source(client: httpx.AsyncClient, limiter: HostLimiter, source: NewsSource) -> list:
+    async with limiter(source.url):
+        try:
+            resp = await client.get(source.url, params=source.params)
+        except httpx.HTTPError as e:
+            logger.error("Error calling %s: %s", source.name, e)
+            return []
+
+    if resp.status_code != 200:
+        logger.error("%s error (%s): %s", source.name, resp.status_code, resp.text[:300])
+        return []
+
+    try:
+        stories = parse_articles(resp.json())
+    except ValueError as e:
+        logger.error("%s returned invalid JSON: %s", source.name, e)
+        return []
+    logger.info("Fetched %d candidate stories from %s.", len(stories), source.name)
+    return stories
+
+
+async def summarize(openai_client, semaphore: asyncio.Semaphore, text: str) -> str:
+    text = (text or "").strip()
+    if openai_client is None or not text:
+        return fallback_summary(text)
+    async with semaphore:
+        try:
+            res = await openai_client.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=[{"role": "user", "content": summary_prompt(text)}],
+                max_tokens=120,
+                temperature=0.6,
+            )
+            return res.choices[0].message.content.strip()
+        except Exception as e:
+            logger.warning("OpenAI (async client) failed: %s", e)
+            return fallback_summary(text)
+
+
+async def _wait_until(tasks, deadline: float):
+    """
+    Waits for `tasks` until the loop-time `deadline`, cancelling stragglers.
+    Returns {task: result} for the ones that finished cleanly.
+    """
+    if not tasks:
+        return {}
+    loop = asyncio.get_running_loop()
+    done, pending = await asyncio.wait(tasks, timeout=max(deadline - loop.time(), 0))
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+        logger.warning("Cycle deadline hit; cancelled %d pending task(s).", len(pending))
+
+    results = {}
+    for task in done:
+        if task.exception() is not None:
+            logger.error("Ingestion task failed: %s", task.exception())
+            continue
+        results[task] = task.result()
+    return results
+
+
+# -----------------------
+# DB (run in a worker thread)
+# -----------------------
+
+def _existing_urls(app, urls) -> set:
+    from .models import TrendingStory, db
+
+    with app.app_context():
+        rows = db.session.query(TrendingStory.source_url).filter(
+            TrendingStory.source_url.in_(list(urls))).all()
+        return {u for (u,) in rows}
+
+
+def _bulk_insert(app, rows) -> int:
+    from .models import TrendingStory, db
+
+    if not rows:
+        return 0
+    with app.app_context():
+        try:
+            db.session.execute(db.insert(TrendingStory), rows)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error("DB commit failed: %s", e)
+            return 0
+    return len(rows)
+
+
+# -----------------------
+# Cycle
+# -----------------------
+
+async def run_cycle(app, sources, http_client, openai_client=None,
+                    deadline: float = INGEST_CYCLE_DEADLINE) -> int:
+    """
+    One ingestion pass. Everything (fetches and summaries) shares a single
+    `deadline` in seconds; whatever hasn't finished by then is cancelled and
+    stories without an AI summary fall back to truncated text.
+    Returns the number of new stories written.
+    """
+    loop = asyncio.get_running_loop()
+    until = loop.time() + deadline
+    limiter = HostLimiter()
+
+    fetches = [asyncio.create_task(fetch_source(http_client, limiter, s)) for s in sources]
+    fetched = await _wait_until(fetches, until)
+
+    stories = {}
+    for task in fetches:   # keep source order
+        for s in fetched.get(task, []):
+            stories.setdefault(s["source_url"], s)
+    if not stories:
+        logger.info("No stories fetched this cycle.")
+        return 0
+
+    existing = await asyncio.to_thread(_existing_urls, app, stories.keys())
+    fresh = [s for url, s in stories.items() if url not in existing]
+
+    semaphore = asyncio.Semaphore(INGEST_SUMMARY_CONCURRENCY)
+    summaries = [asyncio.create_task(summarize(openai_client, semaphore, s["description"])) for s in fresh]
+    summarized = await _wait_until(summaries, until)
+
+    now = datetime.utcnow()
+    rows = [{
+        "title": s["title"][:200],
+        "description": summarized.get(task) or fallback_summary(s["description"]),
+        "image_url": s["image_url"],
+        "source_url": s["source_url"],
+        "date_posted": now,
+    } for s, task in zip(fresh, summaries)]
+
+    written = await asyncio.to_thread(_bulk_insert, app, rows)
+    logger.info("%d new trending stories added.", written)
+    return written
+
+
+def make_http_client(**kwargs) -> httpx.AsyncClient:
+    kwargs.setdefault("limits", HTTP_LIMITS)
+    kwargs.setdefault("timeout", HTTP_TIMEOUT)
+    kwargs.setdefault("headers", {"User-Agent": "TechBlogAI/1.0"})
+    return httpx.AsyncClient(**kwargs)
+
+
+def make_openai_client():
+    if _AsyncOpenAI is None or not OPENAI_API_KEY:
+        return None
+    return _AsyncOpenAI(api_key=OPENAI_API_KEY, timeout=30.0)
+
+
+async def run_forever(app, sources=None, interval_minutes: float = INGEST_INTERVAL_MINUTES, once=False):
+    """
+    Polls every `interval_minutes` until cancelled (SIGINT/SIGTERM).
+    HTTP and OpenAI clients (and their connection pools) live for the whole run.
+    """
+    sources = sources if sources is not None else default_sources()
+    if not sources:
+        logger.error("No news sources configured (set NEWS_API_KEY or INGEST_FEED_URLS).")
+        return
+
+    openai_client = make_openai_client()
+    try:
+        async with make_http_client() as http_client:
+            while True:
+                try:
+                    await run_cycle(app, sources, http_client, openai_client)
+                except Exception as e:
+                    logger.error("Ingestion cycle failed: %s", e)
+                if once:
+                    break
+                await asyncio.sleep(interval_minutes * 60)
+    finally:
+        if openai_client is not None:
+            await openai_client.close()
+
+
+async def _main(once: bool):
+    from . import create_app
+
+    app = create_app(start_scheduler=False)
+    task = asyncio.current_task()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, task.cancel)
+        except NotImplementedError:   # Windows
+            pass
+    try:
+        await run_forever(app, once=once)
+    except asyncio.CancelledError:
+        logger.info("Ingestion worker stopped.")
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(once="--once" in sys.argv[1:]))
@@ -0,0 +1,108 @@
+import logging
+
+from sqlalchemy import inspect, text
+
+from . import db
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------------------
+# Small schema helpers (no Alembic)
+# -------------------------------
+
+def _has_column(table: str, column: str) -> bool:
+    return column in {c["name"] for c in inspect(db.engine).get_columns(table)}
+
+
+def _add_column(table: str, column: str, ddl: str):
+    """
+    ALTER TABLE ... ADD COLUMN, skipped when the column already exists.
+    """
+    if _has_column(table, column):
+        return
+    db.session.execute(text(f'ALTER TABLE "{table}" ADD COLUMN {column} {ddl}'))
+    logger.info("Added column %s.%s", table, column)
+
+
+def _create_index(name: str, table: str, columns: str):
+    db.session.execute(text(f'CREATE INDEX IF NOT EXISTS {name} ON "{table}" ({columns})'))
+
+
+# -------------------------------
+# Migrations (each one idempotent)
+# -------------------------------
+
+def _migrate_categories():
+    from .categories import normalize_post_categories
+
+    _add_column("post", "category_id", "INTEGER REFERENCES category (id)")
+    _create_index("ix_post_category_date", "post", "category_id, date_posted")
+    db.session.commit()
+
+    updated = normalize_post_categories()
+    db.session.commit()
+    logger.info("Normalized categories on %d posts.", updated)
+
+
+def _migrate_hot_scores():
+    from .hot import rebuild_hot_scores
+
+    _add_column("post", "hot_score", "FLOAT NOT NULL DEFAULT 0")
+    _add_column("post", "hot_updated_at", "DATETIME")
+    _create_index("ix_post_hot", "post", "hot_score, date_posted")
+    db.session.commit()
+
+    updated = rebuild_hot_scores()
+    logger.info("Rebuilt hot scores for %d posts.", updated)
+
+
+def _migrate_related_posts():
+    from .models import PostTerm
+    from .related import rebuild_related
+
+    # tables come from create_all(); backfill the first time and once more
+    # to populate the inverted index and stored norms
+    _add_column("post_vector", "norm", "FLOAT")
+    db.session.commit()
+    if PostTerm.query.first() is None:
+        rebuild_related()
+
+
+def _migrate_rendered_content():
+    from .rendering import backfill_rendered
+
+    _add_column("post", "content_html", "TEXT")
+    _add_column("post", "excerpt", "VARCHAR(300)")
+    _add_column("post", "word_count", "INTEGER")
+    _add_column("post", "reading_minutes", "INTEGER")
+    db.session.commit()
+
+    rendered = backfill_rendered()
+    logger.info("Rendered content for %d posts.", rendered)
+
+
+def _migrate_retention_indexes():
+    _create_index("ix_trending_story_date_posted", "trending_story", "date_posted")
+    _create_index("ix_like_created_at", "like", "created_at")
+    db.session.commit()
+
+
+MIGRATIONS = [
+    _migrate_categories,
+    _migrate_hot_scores,
+    _migrate_related_posts,
+    _migrate_rendered_content,
+    _migrate_retention_indexes,
+]
+
+
+def upgrade():
+    """
+    Brings an existing database up to the current models:
+    creates new tables, adds new columns/indexes, backfills data.
+    """
+    db.create_all()
+    for migration in MIGRATIONS:
+        logger.info("Running %s", migration.__name__)
+        migration()
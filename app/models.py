@@ -29,6 +29,22 @@ class User(db.Model, UserMixin):
         return check_password_hash(self.password_hash, password)
 
 
+# ---------------------------
+# CATEGORIES
+# ---------------------------
+class Category(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+    slug = db.Column(db.String(120), unique=True, nullable=False, index=True)
+    icon = db.Column(db.String(16))                  # emoji shown on the filter buttons
+
+    # maintained on post create/delete (see app/categories.py)
+    post_count = db.Column(db.Integer, nullable=False, default=0)
+
+    # Relationships
+    posts = db.relationship("Post", backref="category_ref", lazy="dynamic")
+
+
 # ---------------------------
 # BLOG POSTS
 # ---------------------------
@@ -36,8 +52,16 @@ class Post(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     summary = db.Column(db.Text, nullable=False)   # short description
-    content = db.Column(db.Text, nullable=True)    # full blog/article text
-    category = db.Column(db.String(100), nullable=False, default="General")
+    # large columns are deferred: feeds never load them (see app/queries.py)
+    content = db.deferred(db.Column(db.Text, nullable=True))    # full blog/article text (Markdown)
+
+    # rendered once at create/edit time (see app/rendering.py)
+    content_html = db.deferred(db.Column(db.Text))   # sanitized HTML
+    excerpt = db.Column(db.String(300))               # plain-text excerpt
+    word_count = db.Column(db.Integer)
+    reading_minutes = db.Column(db.Integer)
+    category = db.Column(db.String(100), nullable=False, default="General")   # display name, mirrors category_ref.name
+    category_id = db.Column(db.Integer, db.ForeignKey("category.id"))
 
     # media (optional uploads or links)
     image_url = db.Column(db.String(500))
@@ -46,12 +70,54 @@ class Post(db.Model):
     date_posted = db.Column(db.DateTime, default=datetime.utcnow)
     status = db.Column(db.String(20), default="published")
 
+    # "hot" ranking: likes with time decay (see app/hot.py)
+    hot_score = db.Column(db.Float, nullable=False, default=0.0)
+    hot_updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
     # Foreign key → User
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
 
     # Relationships
     likes = db.relationship("Like", backref="post", lazy="dynamic", cascade="all, delete-orphan")
 
+    # category feeds are range scans over (category_id, date_posted),
+    # hot feed is a top-N read of ix_post_hot
+    __table_args__ = (
+        db.Index("ix_post_category_date", "category_id", "date_posted"),
+        db.Index("ix_post_hot", "hot_score", "date_posted"),
+    )
+
+
+# ---------------------------
+# RELATED POSTS (precomputed, see app/related.py)
+# ---------------------------
+class PostVector(db.Model):
+    post_id = db.Column(db.Integer, db.ForeignKey("post.id"), primary_key=True)
+    # sparse hashed term vector: int32 bucket ids + float32 (1 + log tf) weights
+    indices = db.Column(db.LargeBinary, nullable=False)
+    weights = db.Column(db.LargeBinary, nullable=False)
+    # tf-idf length with the idf at indexing time (refreshed by a full rebuild)
+    norm = db.Column(db.Float)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class PostTerm(db.Model):
+    # inverted index over PostVector: bucket -> posts using it, (1 + log tf) weight
+    bucket = db.Column(db.Integer, primary_key=True)
+    post_id = db.Column(db.Integer, db.ForeignKey("post.id"), primary_key=True, index=True)
+    weight = db.Column(db.Float, nullable=False)
+
+
+class RelatedPost(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    post_id = db.Column(db.Integer, db.ForeignKey("post.id"), nullable=False)
+    related_id = db.Column(db.Integer, db.ForeignKey("post.id"), nullable=False)
+    score = db.Column(db.Float, nullable=False)
+    rank = db.Column(db.Integer, nullable=False)   # 0 = most similar
+
+    # "Related posts" block reads one post's neighbours in rank order
+    __table_args__ = (db.Index("ix_related_post_rank", "post_id", "rank"),)
+
 
 # ---------------------------
 # TRENDING STORIES (AI fetched)
@@ -62,7 +128,7 @@ class TrendingStory(db.Model):
     description = db.Column(db.Text, nullable=False)
     image_url = db.Column(db.String(500))
     source_url = db.Column(db.String(500))
-    date_posted = db.Column(db.DateTime, default=datetime.utcnow)
+    date_posted = db.Column(db.DateTime, default=datetime.utcnow, index=True)   # retention cutoff
 
 
 # ---------------------------
@@ -90,7 +156,27 @@ class Like(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
     post_id = db.Column(db.Integer, db.ForeignKey("post.id"), nullable=False, index=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)   # retention cutoff
 
     # prevent duplicate likes
     __table_args__ = (db.UniqueConstraint("user_id", "post_id", name="uq_user_post_like"),)
+
+
+# ---------------------------
+# AGGREGATES (deferred; list views undefer them so counts come back in the same query)
+# ---------------------------
+Post.like_count = db.column_property(
+    db.select(db.func.count(Like.id))
+    .where(Like.post_id == Post.id)
+    .correlate_except(Like)
+    .scalar_subquery(),
+    deferred=True,
+)
+
+User.post_count = db.column_property(
+    db.select(db.func.count(Post.id))
+    .where(Post.user_id == User.id)
+    .correlate_except(Post)
+    .scalar_subquery(),
+    deferred=True,
+)
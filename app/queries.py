@@ -0,0 +1,53 @@
+from sqlalchemy.orm import joinedload, load_only, undefer
+
+from .models import Post, User
+
+# Columns the feed cards (home.html / blogs.html) actually render.
+FEED_COLUMNS = (
+    Post.id, Post.title, Post.summary, Post.excerpt, Post.reading_minutes, Post.category,
+    Post.image_url, Post.video_url, Post.date_posted, Post.user_id,
+)
+
+
+def feed_options(*extra_columns):
+    """
+    Loader options for post lists: only rendered columns, the author's
+    username via a JOIN and the like count as a correlated subquery,
+    so a whole feed is one SELECT.
+    """
+    return (
+        load_only(*FEED_COLUMNS, *extra_columns),
+        joinedload(Post.author).load_only(User.id, User.username),
+        undefer(Post.like_count),
+    )
+
+
+def detail_options():
+    """
+    post_detail: the row with its pre-rendered HTML (raw content stays
+    deferred) plus author and like count in one SELECT.
+    """
+    return (
+        undefer(Post.content_html),
+        joinedload(Post.author).load_only(User.id, User.username),
+        undefer(Post.like_count),
+    )
+
+
+def related_options():
+    """
+    The "Related posts" block only shows title, category and date.
+    """
+    return (load_only(Post.id, Post.title, Post.category, Post.date_posted),)
+
+
+def admin_post_options():
+    # admin cards also show status
+    return feed_options(Post.status)
+
+
+def admin_user_options():
+    return (
+        load_only(User.id, User.username, User.email, User.is_admin),
+        undefer(User.post_count),
+    )
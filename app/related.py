@@ -0,0 +1,338 @@
+import re
+import zlib
+import logging
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy.orm import load_only
+
+from .models import Post, PostVector, PostTerm, RelatedPost, db
+from .queries import related_options
+
+logger = logging.getLogger(__name__)
+
+# Hashed TF-IDF: every token is hashed into one of DIMENSIONS buckets.
+# Vectors are stored per post (PostVector) and inverted by bucket (PostTerm),
+# so scoring only ever touches posts that share a bucket with the query.
+DIMENSIONS = 2 ** 12
+TOP_K = 5
+
+# On create, only the new post's closest CANDIDATES_FACTOR * TOP_K posts are
+# considered for having their own neighbour lists updated.
+CANDIDATES_FACTOR = 5
+
+_TOKEN_RE = re.compile(r"[a-z0-9]{2,}")
+_STOPWORDS = frozenset("""
+a an and are as at be but by can do for from has have how i in is it its
+just more new not of on or our so than that the their them then there these
+they this to was we were what when which who will with you your
+""".split())
+
+
+# -----------------------
+# Vectorizing
+# -----------------------
+
+def _tokens(text: str):
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if t not in _STOPWORDS]
+
+
+def _post_text(post) -> str:
+    # title counted twice so it outweighs body boilerplate
+    return " ".join([post.title or "", post.title or "", post.summary or "", post.content or ""])
+
+
+def vectorize(text: str):
+    """
+    Hashes `text` into a sparse term vector.
+    Returns (bucket ids int32, 1 + log(tf) float32), sorted by bucket.
+    """
+    buckets = np.fromiter(
+        (zlib.crc32(t.encode("utf-8")) % DIMENSIONS for t in _tokens(text)),
+        dtype=np.int32,
+    )
+    if buckets.size == 0:
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+    ids, counts = np.unique(buckets, return_counts=True)
+    return ids.astype(np.int32), (1.0 + np.log(counts)).astype(np.float32)
+
+
+def _store_vector(post_id: int, ids, weights, norm: float = None):
+    row = db.session.get(PostVector, post_id) or PostVector(post_id=post_id)
+    row.indices = ids.tobytes()
+    row.weights = weights.tobytes()
+    row.norm = norm
+    row.updated_at = datetime.utcnow()
+    db.session.add(row)
+
+
+def _store_terms(post_id: int, ids, weights):
+    PostTerm.query.filter_by(post_id=post_id).delete(synchronize_session=False)
+    if ids.size:
+        db.session.execute(db.insert(PostTerm), [
+            {"bucket": int(b), "post_id": post_id, "weight": float(w)}
+            for b, w in zip(ids, weights)
+        ])
+
+
+def _load_corpus():
+    """
+    All stored vectors as flat arrays:
+    post_ids[n], doc[nnz] (row of each entry), ids[nnz], weights[nnz].
+    Only the offline rebuild reads the whole corpus.
+    """
+    rows = db.session.query(PostVector.post_id, PostVector.indices, PostVector.weights).all()
+    post_ids = np.array([r[0] for r in rows], dtype=np.int64)
+    ids = [np.frombuffer(r[1], dtype=np.int32) for r in rows]
+    weights = [np.frombuffer(r[2], dtype=np.float32) for r in rows]
+    lengths = np.array([len(i) for i in ids], dtype=np.int64)
+
+    doc = np.repeat(np.arange(len(rows)), lengths)
+    ids = np.concatenate(ids) if ids else np.empty(0, dtype=np.int32)
+    weights = np.concatenate(weights) if weights else np.empty(0, dtype=np.float32)
+    return post_ids, doc, ids, weights
+
+
+def _idf(df, n_docs: int):
+    return (np.log((1.0 + n_docs) / (1.0 + df)) + 1.0).astype(np.float32)
+
+
+def _sum_by_doc(docs, values):
+    """
+    Sparse accumulate: (unique docs, summed values), without an n_posts-wide array.
+    """
+    unique, inverse = np.unique(docs, return_inverse=True)
+    return unique, np.bincount(inverse, weights=values, minlength=len(unique))
+
+
+def _top_k(scores, k: int):
+    """
+    Positions of the k largest positive scores, best first.
+    """
+    k = min(k, int((scores > 0).sum()))
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+# -----------------------
+# Incremental update
+# -----------------------
+
+def index_post(post: Post, k: int = TOP_K):
+    """
+    Vectorizes a new/edited post, stores its top-k neighbours and inserts it
+    into the neighbour lists of the closest existing posts.
+
+    Only the postings of the post's own buckets are read (one indexed
+    query), so the cost grows with the posts that share its terms, not
+    with the corpus. Other posts' lengths use the idf stored when they
+    were indexed; `rebuild_related` brings those back in line. Caller commits.
+    """
+    ids, weights = vectorize(_post_text(post))
+    PostTerm.query.filter_by(post_id=post.id).delete(synchronize_session=False)
+
+    postings = []
+    if ids.size:
+        postings = (
+            db.session.query(PostTerm.post_id, PostTerm.bucket, PostTerm.weight, PostVector.norm)
+            .join(PostVector, PostVector.post_id == PostTerm.post_id)
+            .filter(PostTerm.bucket.in_(ids.tolist()))
+            .all()
+        )
+    docs = np.array([r[0] for r in postings], dtype=np.int64)
+    buckets = np.array([r[1] for r in postings], dtype=np.int64)
+    doc_weights = np.array([r[2] for r in postings], dtype=np.float32)
+    doc_norms = np.array([r[3] or 0.0 for r in postings], dtype=np.float32)
+
+    # document frequencies of the query's buckets, counting this post
+    n_docs = db.session.query(PostVector.post_id).filter(PostVector.post_id != post.id).count() + 1
+    df = np.bincount(buckets, minlength=DIMENSIONS)
+    df[ids] += 1
+    idf = _idf(df, n_docs)
+
+    query = np.zeros(DIMENSIONS, dtype=np.float32)
+    query[ids] = weights * idf[ids]
+    query_norm = float(np.linalg.norm(query))
+    _store_vector(post.id, ids, weights, query_norm)
+    _store_terms(post.id, ids, weights)
+
+    post_ids, dots = _sum_by_doc(docs, doc_weights * idf[buckets] * query[buckets])
+    norms = np.zeros(len(post_ids), dtype=np.float32)
+    norms[np.searchsorted(post_ids, docs)] = doc_norms
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sims = np.where(norms * query_norm > 0, dots / (norms * query_norm), 0.0)
+    sims[post_ids == post.id] = 0.0
+
+    # this post's own neighbours
+    RelatedPost.query.filter_by(post_id=post.id).delete(synchronize_session=False)
+    top = _top_k(sims, k)
+    db.session.add_all([
+        RelatedPost(post_id=post.id, related_id=int(post_ids[p]), score=float(sims[p]), rank=rank)
+        for rank, p in enumerate(top)
+    ])
+
+    # push this post into the lists of its closest posts where it qualifies
+    candidates = {int(post_ids[p]): float(sims[p]) for p in _top_k(sims, k * CANDIDATES_FACTOR)}
+    if not candidates:
+        return
+    existing = {}
+    for row in RelatedPost.query.filter(RelatedPost.post_id.in_(list(candidates))).all():
+        existing.setdefault(row.post_id, []).append(row)
+
+    for other_id, score in candidates.items():
+        rows = []
+        for row in existing.get(other_id, []):
+            if row.related_id == post.id:
+                db.session.delete(row)   # stale entry from a previous edit
+            else:
+                rows.append(row)
+        if len(rows) >= k and score <= min(r.score for r in rows):
+            continue
+        rows.append(RelatedPost(post_id=other_id, related_id=post.id, score=score, rank=0))
+        rows.sort(key=lambda r: r.score, reverse=True)
+        for rank, row in enumerate(rows):
+            if rank < k:
+                row.rank = rank
+                db.session.add(row)
+            elif row.id is not None:
+                db.session.delete(row)
+
+
+def index_pending(limit: int = 100) -> int:
+    """
+    Background job: indexes posts that have no PostVector yet (new posts are
+    published without waiting on this). Commits per post so one bad post
+    doesn't hold back the rest. Returns posts indexed.
+    """
+    posts = (
+        Post.query.options(load_only(Post.id, Post.title, Post.summary, Post.content))
+        .outerjoin(PostVector, PostVector.post_id == Post.id)
+        .filter(PostVector.post_id.is_(None))
+        .order_by(Post.id.asc())
+        .limit(limit)
+        .all()
+    )
+    indexed = 0
+    for post in posts:
+        try:
+            index_post(post)
+            db.session.commit()
+            indexed += 1
+        except Exception as e:
+            db.session.rollback()
+            logger.warning("Related-posts indexing failed for post %s: %s", post.id, e)
+    if indexed:
+        logger.info("Indexed %d new posts for related posts.", indexed)
+    return indexed
+
+
+def forget_post(post_id: int):
+    """
+    Drops a deleted post's vector and every neighbour row pointing to/from it.
+    """
+    RelatedPost.query.filter(
+        (RelatedPost.post_id == post_id) | (RelatedPost.related_id == post_id)
+    ).delete(synchronize_session=False)
+    PostTerm.query.filter_by(post_id=post_id).delete(synchronize_session=False)
+    PostVector.query.filter_by(post_id=post_id).delete(synchronize_session=False)
+
+
+# -----------------------
+# Offline rebuild
+# -----------------------
+
+def rebuild_related(k: int = TOP_K, batch_size: int = 500) -> int:
+    """
+    Re-vectorizes every post and recomputes all top-k neighbour lists.
+    The corpus is held as sparse arrays plus a bucket-sorted (CSC-style)
+    copy, and each post is scored only against the postings of its own
+    buckets, so memory grows with the number of stored terms rather than
+    n_posts x DIMENSIONS.
+    """
+    PostTerm.query.delete(synchronize_session=False)
+    last_id = 0
+    while True:
+        posts = (
+            Post.query.options(load_only(Post.id, Post.title, Post.summary, Post.content))
+            .filter(Post.id > last_id)
+            .order_by(Post.id.asc())
+            .limit(batch_size)
+            .all()
+        )
+        if not posts:
+            break
+        last_id = posts[-1].id
+        for post in posts:
+            ids, weights = vectorize(_post_text(post))
+            _store_vector(post.id, ids, weights)
+            _store_terms(post.id, ids, weights)
+        db.session.commit()
+        db.session.expunge_all()
+
+    post_ids, doc, ids, weights = _load_corpus()
+    n = len(post_ids)
+    idf = _idf(np.bincount(ids, minlength=DIMENSIONS), n)
+
+    # row-major (by doc) unit tf-idf values, and the same entries by bucket
+    values = weights * idf[ids]
+    norms = np.sqrt(np.bincount(doc, weights=values.astype(np.float64) ** 2, minlength=n))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = np.where(norms[doc] > 0, values / norms[doc], 0.0).astype(np.float32)
+    row_ptr = np.searchsorted(doc, np.arange(n + 1))
+    by_bucket = np.argsort(ids, kind="stable")
+    col_ptr = np.searchsorted(ids[by_bucket], np.arange(DIMENSIONS + 1))
+    col_doc = doc[by_bucket]
+    col_values = values[by_bucket]
+
+    if n:
+        db.session.execute(db.update(PostVector), [
+            {"post_id": int(p), "norm": float(v)} for p, v in zip(post_ids, norms)
+        ])
+    RelatedPost.query.delete(synchronize_session=False)
+    rows = []
+    for i in range(n):
+        start, end = row_ptr[i], row_ptr[i + 1]
+        if start == end:
+            continue
+        spans = [(col_ptr[b], col_ptr[b + 1]) for b in ids[start:end]]
+        others = np.concatenate([col_doc[lo:hi] for lo, hi in spans])
+        products = np.concatenate([col_values[lo:hi] * v for (lo, hi), v in zip(spans, values[start:end])])
+        candidates, scores = _sum_by_doc(others, products)
+        scores[candidates == i] = 0.0
+        for rank, p in enumerate(_top_k(scores, k)):
+            rows.append({
+                "post_id": int(post_ids[i]),
+                "related_id": int(post_ids[candidates[p]]),
+                "score": float(scores[p]),
+                "rank": rank,
+            })
+        if len(rows) >= batch_size * k:
+            db.session.execute(db.insert(RelatedPost), rows)
+            db.session.commit()
+            rows = []
+    if rows:
+        db.session.execute(db.insert(RelatedPost), rows)
+    db.session.commit()
+
+    logger.info("Rebuilt related posts for %d posts.", n)
+    return n
+
+
+# -----------------------
+# Serving
+# -----------------------
+
+def related_posts(post_id: int, limit: int = TOP_K):
+    """
+    The precomputed neighbours of `post_id`, best first, in one query.
+    """
+    return (
+        Post.query.options(*related_options())
+        .join(RelatedPost, RelatedPost.related_id == Post.id)
+        .filter(RelatedPost.post_id == post_id)
+        .order_by(RelatedPost.rank.asc())
+        .limit(limit)
+        .all()
+    )
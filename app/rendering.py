@@ -0,0 +1,134 @@
+import re
+import math
+import html
+import logging
+
+from markupsafe import escape
+from sqlalchemy.orm import load_only
+
+from .models import Post, db
+
+logger = logging.getLogger(__name__)
+
+WORDS_PER_MINUTE = 200
+EXCERPT_LENGTH = 280
+
+_SAFE_SCHEMES = {"http", "https", "mailto"}
+# the only attributes Markdown syntax produces; anything else is dropped
+_SAFE_ATTRIBUTES = {"href", "src", "alt", "title", "start"}
+_URL_ATTRIBUTES = ("href", "src")
+_TAG_RE = re.compile(r"<[^>]+>")
+_SCHEME_RE = re.compile(r"^([a-zA-Z][a-zA-Z0-9+.-]*):")
+# browsers ignore whitespace/control characters inside a URL scheme ("java\tscript:")
+_URL_STRIP_RE = re.compile(r"[\x00-\x20\x7f-\x9f]+")
+
+# Python-Markdown is optional; without it content is rendered as escaped paragraphs.
+markdown = None
+try:
+    import markdown  # type: ignore
+    from markdown.treeprocessors import Treeprocessor  # type: ignore
+    from markdown.extensions import Extension  # type: ignore
+except Exception:
+    markdown = None
+
+
+def is_safe_url(value: str) -> bool:
+    """
+    True for relative URLs and http(s)/mailto ones. The scheme is read the
+    way a browser would: entities decoded ("&#106;avascript:", "&colon;")
+    and whitespace/control characters removed.
+    """
+    url = _URL_STRIP_RE.sub("", html.unescape(value))
+    match = _SCHEME_RE.match(url)
+    return match is None or match.group(1).lower() in _SAFE_SCHEMES
+
+
+if markdown is not None:
+
+    class _SafeLinks(Treeprocessor):
+        """
+        Allow-list pass over the final tree: keeps only the attributes
+        Markdown itself emits, and drops href/src values whose scheme isn't
+        http(s)/mailto (javascript:, data:, ..., entity-encoded or not).
+        """
+
+        def run(self, root):
+            for el in root.iter():
+                for attr in list(el.attrib):
+                    if attr not in _SAFE_ATTRIBUTES:
+                        del el.attrib[attr]
+                    elif attr in _URL_ATTRIBUTES and not is_safe_url(el.attrib[attr]):
+                        del el.attrib[attr]
+
+    class _Sanitize(Extension):
+        """
+        Raw HTML in posts is escaped rather than passed through.
+        """
+
+        def extendMarkdown(self, md):
+            md.preprocessors.deregister("html_block")
+            md.inlinePatterns.deregister("html")
+            md.treeprocessors.register(_SafeLinks(md), "safe_links", 0)
+
+
+def render_html(text: str) -> str:
+    """
+    Markdown -> sanitized HTML.
+    """
+    text = text or ""
+    if markdown is None:
+        paragraphs = [p for p in re.split(r"\n\s*\n", text) if p.strip()]
+        return "\n".join(
+            f"<p>{str(escape(p.strip())).replace(chr(10), '<br>')}</p>" for p in paragraphs
+        )
+    return markdown.markdown(text, extensions=[_Sanitize(), "fenced_code", "sane_lists"])
+
+
+def plain_text(rendered_html: str) -> str:
+    return " ".join(html.unescape(_TAG_RE.sub(" ", rendered_html or "")).split())
+
+
+def make_excerpt(text: str, length: int = EXCERPT_LENGTH) -> str:
+    """
+    Cuts `text` at a word boundary, adding "…" when shortened.
+    """
+    if len(text) <= length:
+        return text
+    cut = text[:length].rsplit(" ", 1)[0]
+    return cut.rstrip(".,;:") + "…"
+
+
+def render_post(post: Post):
+    """
+    Fills the write-time fields (content_html, excerpt, word_count,
+    reading_minutes) from post.content. Call on create/edit; caller commits.
+    """
+    post.content_html = render_html(post.content)
+    text = plain_text(post.content_html)
+    post.word_count = len(text.split())
+    post.reading_minutes = max(1, math.ceil(post.word_count / WORDS_PER_MINUTE))
+    post.excerpt = make_excerpt(text)
+
+
+def backfill_rendered(batch_size: int = 200, only_missing: bool = True) -> int:
+    """
+    Renders stored posts in primary-key batches, committing per batch.
+    Returns posts rendered.
+    """
+    last_id = 0
+    rendered = 0
+    while True:
+        query = Post.query.options(load_only(Post.id, Post.content)).filter(Post.id > last_id)
+        if only_missing:
+            query = query.filter(Post.content_html.is_(None))
+        posts = query.order_by(Post.id.asc()).limit(batch_size).all()
+        if not posts:
+            break
+        last_id = posts[-1].id
+        for post in posts:
+            render_post(post)
+        db.session.commit()
+        db.session.expunge_all()
+        rendered += len(posts)
+        logger.info("Rendered %d posts (up to id %d).", rendered, last_id)
+    return rendered
@@ -1,8 +1,9 @@
 # reset_db.py
 from app import create_app, db
+from app.categories import ensure_default_categories
 
 def reset_database():
-    app = create_app()
+    app = create_app(start_scheduler=False)
     with app.app_context():
         print("⚠️ Dropping all tables...")
         db.drop_all()
@@ -12,5 +13,9 @@ def reset_database():
         db.create_all()
         print("✅ Tables created.")
 
+        ensure_default_categories()
+        db.session.commit()
+        print("✅ Default categories seeded.")
+
 if __name__ == "__main__":
     reset_database()
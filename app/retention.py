@@ -0,0 +1,164 @@
+import os
+import gzip
+import json
+import logging
+from datetime import datetime, timedelta
+from dataclasses import dataclass
+from typing import Optional
+
+from flask import current_app
+
+from .models import TrendingStory, Like, db
+from .transfer import encode_value
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default):
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return int(value)
+
+
+RETENTION_BATCH_SIZE = _env_int("RETENTION_BATCH_SIZE", 500)
+
+
+@dataclass
+class RetentionPolicy:
+    model: type
+    time_column: str
+    max_age_days: Optional[int] = None   # rows older than this expire
+    keep_last: Optional[int] = None      # ...as do rows beyond the newest N
+    archive: bool = True
+
+    @property
+    def table(self) -> str:
+        return self.model.__tablename__
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_age_days is not None or self.keep_last is not None
+
+
+def default_policies() -> list:
+    """
+    Trending stories: newest 200, as the old _trim_trending kept, so a
+    table of 200 rows or fewer is never touched; RETENTION_TRENDING_DAYS
+    adds an age limit on top (unset by default).
+    Likes: off unless RETENTION_LIKE_DAYS is set, since expiring likes
+    lowers the like counts shown on posts.
+    """
+    return [
+        RetentionPolicy(
+            TrendingStory, "date_posted",
+            max_age_days=_env_int("RETENTION_TRENDING_DAYS", None),
+            keep_last=_env_int("RETENTION_TRENDING_KEEP", 200),
+            archive=os.getenv("RETENTION_TRENDING_ARCHIVE", "1") == "1",
+        ),
+        RetentionPolicy(
+            Like, "created_at",
+            max_age_days=_env_int("RETENTION_LIKE_DAYS", None),
+            archive=os.getenv("RETENTION_LIKE_ARCHIVE", "1") == "1",
+        ),
+    ]
+
+
+def _cutoff(policy: RetentionPolicy, now: datetime):
+    """
+    Rows with time_column < cutoff expire. Both limits are index lookups
+    on the time column; the later (stricter) of the two wins.
+    """
+    column = getattr(policy.model, policy.time_column)
+    cutoffs = []
+    if policy.max_age_days is not None:
+        cutoffs.append(now - timedelta(days=policy.max_age_days))
+    if policy.keep_last is not None:
+        boundary = (
+            db.session.query(column)
+            .order_by(column.desc())
+            .offset(max(policy.keep_last - 1, 0))
+            .limit(1)
+            .scalar()
+        )
+        if boundary is not None:
+            cutoffs.append(boundary)
+    return max(cutoffs) if cutoffs else None
+
+
+def _archive(policy: RetentionPolicy, rows, archive_dir: str):
+    """
+    Appends rows to monthly gzip partitions. Each call adds a gzip member,
+    which gzip.open() reads back as one stream.
+    """
+    by_month = {}
+    for row in rows:
+        stamp = getattr(row, policy.time_column) or datetime.utcnow()
+        by_month.setdefault(stamp.strftime("%Y-%m"), []).append(row)
+
+    directory = os.path.join(archive_dir, policy.table)
+    os.makedirs(directory, exist_ok=True)
+    columns = [c.name for c in policy.model.__table__.columns]
+    for month, month_rows in by_month.items():
+        with gzip.open(os.path.join(directory, f"{month}.jsonl.gz"), "at", encoding="utf-8") as fh:
+            for row in month_rows:
+                fh.write(json.dumps({c: encode_value(getattr(row, c)) for c in columns}, ensure_ascii=False))
+                fh.write("\n")
+
+
+def apply_policy(policy: RetentionPolicy, now: datetime = None,
+                 batch_size: int = RETENTION_BATCH_SIZE, archive_dir: str = None) -> int:
+    """
+    Deletes expired rows oldest first in batches of `batch_size`, committing
+    after each batch so no write lock is held for long. With archiving on,
+    a batch is written to its partition file before it is deleted (a crash
+    in between can archive a batch twice, never lose it). Returns rows removed.
+    """
+    if not policy.enabled:
+        return 0
+    now = now or datetime.utcnow()
+    cutoff = _cutoff(policy, now)
+    if cutoff is None:
+        return 0
+
+    model = policy.model
+    column = getattr(model, policy.time_column)
+    removed = 0
+
+    while True:
+        rows = (
+            model.query.filter(column < cutoff)
+            .order_by(column.asc(), model.id.asc())
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+        if policy.archive and archive_dir:
+            _archive(policy, rows, archive_dir)
+
+        ids = [row.id for row in rows]
+        model.query.filter(model.id.in_(ids)).delete(synchronize_session=False)
+        db.session.commit()
+        db.session.expunge_all()
+        removed += len(ids)
+
+    if removed:
+        logger.info("Retention removed %d rows from %s (before %s).", removed, policy.table, cutoff)
+    return removed
+
+
+def apply_retention(policies=None, archive_dir: str = None) -> dict:
+    """
+    Runs every policy; one failing table doesn't stop the others.
+    Archives go to RETENTION_ARCHIVE_DIR (app config) unless given.
+    """
+    archive_dir = archive_dir or current_app.config.get("RETENTION_ARCHIVE_DIR")
+    results = {}
+    for policy in policies if policies is not None else default_policies():
+        try:
+            results[policy.table] = apply_policy(policy, archive_dir=archive_dir)
+        except Exception as e:
+            db.session.rollback()
+            logger.warning("Retention for %s failed: %s", policy.table, e)
+    return results
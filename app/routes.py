@@ -1,10 +1,18 @@
-from flask import Blueprint, render_template, request, session, redirect, url_for, flash, jsonify, current_app
+from flask import Blueprint, render_template, request, session, redirect, url_for, flash, jsonify, current_app, abort
 from .models import Post, User, TrendingStory, Like, Profile, db
+from .hot import record_like, hot_posts
+from .related import related_posts
+from .queries import feed_options, detail_options
+from .rendering import render_post
+from .suggest import suggest_index, add_post as add_post_suggestion
+from .categories import (get_category, get_or_create_category, assign_category,
+                         nav_categories, DEFAULT_CATEGORY)
 from flask_login import login_required, current_user
 from .utils import save_upload
 from .ai_agent import generate_summary
 from werkzeug.utils import secure_filename
 import os
+from datetime import datetime
 
 
 main = Blueprint('main', __name__)
@@ -16,9 +24,17 @@ def home():
     trending = TrendingStory.query.order_by(
         TrendingStory.date_posted.desc()).limit(10).all()
 
-    posts = Post.query.order_by(
+    posts = Post.query.options(*feed_options()).order_by(
         Post.date_posted.desc()).all()  # fetch all newest first
-    return render_template('home.html', posts=posts, trending=trending)
+    return render_template('home.html', posts=posts, trending=trending,
+                           categories=nav_categories())
+
+
+@main.route('/hot')
+def hot():
+    # precomputed ranking, no join over Like at request time
+    return render_template('home.html', posts=hot_posts(), trending=[],
+                           categories=nav_categories(), feed='hot')
 
 
 @main.route('/api/trending')
@@ -33,26 +49,53 @@ def get_trending():
     } for s in stories])
 
 
-@main.route('/category/<string:category_name>')
-def category(category_name):
-    posts = Post.query.filter(Post.category.ilike(f'%{category_name}%')).order_by(
+@main.route('/api/suggest')
+def suggest():
+    # answered from the in-memory prefix index, not the database;
+    # profiles need a login, so anonymous visitors get no user suggestions
+    q = request.args.get('q', '')[:100]
+    kinds = None if current_user.is_authenticated else ("post", "category")
+    results = []
+    for kind, ref, label in suggest_index.lookup(q, kinds=kinds):
+        if kind == "post":
+            url = url_for('main.post_detail', post_id=ref)
+        elif kind == "category":
+            url = url_for('main.category', slug=ref)
+        else:
+            url = url_for('main.profile_view', username=ref)
+        results.append({"label": label, "kind": kind, "url": url})
+    return jsonify(results)
+
+
+@main.route('/category/<string:slug>')
+def category(slug):
+    # exact slug match (old links passing the display name still resolve)
+    current = get_category(slug)
+    if current is None:
+        abort(404)
+    # index range scan on ix_post_category_date
+    posts = Post.query.options(*feed_options()).filter_by(category_id=current.id).order_by(
         Post.date_posted.desc()).all()
-    return render_template('home.html', posts=posts, trending=[])
+    return render_template('home.html', posts=posts, trending=[],
+                           categories=nav_categories(), current_category=current)
 
 
 @main.route("/search")
 def search():
     query = request.args.get('q')
-    posts = Post.query.filter(Post.title.contains(query) | Post.summary.contains(query))\
+    posts = Post.query.options(*feed_options())\
+                      .filter(Post.title.contains(query) | Post.summary.contains(query))\
                       .order_by(Post.date_posted.desc()).all()
 
-    return render_template('home.html', posts=posts, search_query=query)
+    return render_template('home.html', posts=posts, search_query=query,
+                           categories=nav_categories())
 
 
 @main.route('/post/<int:post_id>')
 def post_detail(post_id):
-    post = Post.query.get_or_404(post_id)
-    return render_template('post_detail.html', post=post)
+    post = Post.query.options(*detail_options()).filter_by(id=post_id).first_or_404()
+    return render_template('post_detail.html', post=post,
+                           related=related_posts(post.id))
 
 
 @main.route('/dashboard')
@@ -64,7 +107,7 @@ def dashboard():
 
 @main.route('/blogs')
 def blogs():
-    posts = Post.query.order_by(Post.date_posted.desc()).all()
+    posts = Post.query.options(*feed_options()).order_by(Post.date_posted.desc()).all()
     return render_template('blogs.html', posts=posts)
 
 
@@ -144,8 +187,9 @@ def create_post():
     if request.method == "POST":
         title = request.form.get("title", "").strip()
         content = request.form.get("content", "").strip()
-        # optional, if your Post has it
-        category = request.form.get("category", "").strip()
+        # must be one of the known categories; anything else lands in General
+        category = get_category(request.form.get("category", "")) \
+            or get_or_create_category(DEFAULT_CATEGORY)
 
         if not title or not content:
             flash("Title and content are required.", "danger")
@@ -169,16 +213,21 @@ def create_post():
             summary=summary if summary else None,
             image_url=image_path,
             video_url=video_path,
-            category=category if category else "General",
             user_id=current_user.id,
             status="published"
         )
+        assign_category(post, category)
+        render_post(post)   # HTML/excerpt/reading time stored once, not per view
         db.session.add(post)
         db.session.commit()
+        # related-posts neighbours are computed by the index_pending background job
+
+        add_post_suggestion(post)
+
         flash("Post created!", "success")
         return redirect(url_for("main.post_detail", post_id=post.id))
 
-    return render_template("create_post.html")
+    return render_template("create_post.html", categories=nav_categories())
 
 # ----- LIKE/UNLIKE -----
 
@@ -190,11 +239,13 @@ def like_post(post_id):
     existing = Like.query.filter_by(
         user_id=current_user.id, post_id=post.id).first()
     if existing:
+        record_like(post.id, existing.created_at, liked=False)
         db.session.delete(existing)
         db.session.commit()
         return jsonify({"status": "unliked", "likes": Like.query.filter_by(post_id=post.id).count()})
     else:
-        like = Like(user_id=current_user.id, post_id=post.id)
+        like = Like(user_id=current_user.id, post_id=post.id, created_at=datetime.utcnow())
+        record_like(post.id, like.created_at, liked=True)
         db.session.add(like)
         db.session.commit()
         return jsonify({"status": "liked", "likes": Like.query.filter_by(post_id=post.id).count()})
@@ -0,0 +1,181 @@
+import bisect
+import logging
+import threading
+
+from .models import Post, Category, User, db
+
+logger = logging.getLogger(__name__)
+
+# Rough memory ceiling for the index (keys + per-entry overhead).
+SUGGEST_MAX_BYTES = 32 * 1024 * 1024
+SUGGEST_LIMIT = 8
+
+_ENTRY_OVERHEAD = 120   # bytes: tuple + str headers + list slots, measured roughly
+
+
+def _normalize(text: str) -> str:
+    return " ".join((text or "").lower().split())
+
+
+def _title_keys(title: str):
+    """
+    "Linux kernel release" -> "linux kernel release", "kernel release", "release"
+    so a prefix of any word in the title matches.
+    """
+    words = _normalize(title).split(" ")
+    return [" ".join(words[i:]) for i in range(len(words)) if words[i]]
+
+
+class PrefixIndex:
+    """
+    Sorted-array prefix index: lookups are a bisect plus a short forward scan.
+    Entries are (key, kind, ref, label); kind is "post", "category" or "user".
+    Reads are lock-free against an immutable snapshot; writers copy-on-write
+    under a lock, and rebuild() swaps in a freshly built snapshot.
+    """
+
+    def __init__(self, max_bytes: int = SUGGEST_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._snapshot = ([], [])   # (sorted keys, entries), swapped as one object
+        self._bytes = 0
+        self._full_warned = False
+
+    def __len__(self):
+        return len(self._snapshot[0])
+
+    @staticmethod
+    def _size(key: str) -> int:
+        return len(key) + _ENTRY_OVERHEAD
+
+    # -------- writes --------
+
+    def rebuild(self, entries):
+        """
+        Replaces the whole index from an iterable of (key, kind, ref, label).
+        Entries past the byte budget are dropped in stream order (so feed the
+        ones that must survive first) and counted per kind in the log.
+        """
+        items, size, dropped = [], 0, {}
+        for entry in entries:
+            if size + self._size(entry[0]) > self.max_bytes:
+                dropped[entry[1]] = dropped.get(entry[1], 0) + 1
+                continue
+            size += self._size(entry[0])
+            items.append(entry)
+        if dropped:
+            logger.warning("Suggest index hit its %d byte budget; dropped %s.", self.max_bytes,
+                           ", ".join(f"{n} {kind} keys" for kind, n in sorted(dropped.items())))
+        items.sort()
+        with self._lock:
+            self._snapshot = ([e[0] for e in items], items)
+            self._bytes = size
+            self._full_warned = False
+
+    def add(self, key: str, kind: str, ref, label: str):
+        self.add_many([(key, kind, ref, label)])
+
+    def add_many(self, new_entries):
+        """
+        Inserts several (key, kind, ref, label) with one copy of the arrays,
+        e.g. all the keys of one post title.
+        """
+        new_entries = [(_normalize(e[0]),) + tuple(e[1:]) for e in new_entries]
+        new_entries = sorted(e for e in new_entries if e[0])
+        if not new_entries:
+            return
+        with self._lock:
+            size = sum(self._size(e[0]) for e in new_entries)
+            if self._bytes + size > self.max_bytes:
+                if not self._full_warned:
+                    logger.warning("Suggest index is at its byte budget; skipping new entries.")
+                    self._full_warned = True
+                return
+            keys, entries = (list(x) for x in self._snapshot)
+            for entry in new_entries:
+                i = bisect.bisect_left(entries, entry)
+                keys.insert(i, entry[0])
+                entries.insert(i, entry)
+            self._snapshot = (keys, entries)
+            self._bytes += size
+
+    def remove(self, kind: str, ref):
+        with self._lock:
+            entries = self._snapshot[1]
+            keep = [e for e in entries if not (e[1] == kind and e[2] == ref)]
+            if len(keep) == len(entries):
+                return
+            self._snapshot = ([e[0] for e in keep], keep)
+            self._bytes = sum(self._size(e[0]) for e in keep)
+
+    # -------- reads --------
+
+    def lookup(self, prefix: str, limit: int = SUGGEST_LIMIT, kinds=None):
+        """
+        Up to `limit` distinct (kind, ref, label) whose key starts with `prefix`,
+        optionally only of the given `kinds`.
+        """
+        prefix = _normalize(prefix)
+        if not prefix:
+            return []
+        keys, entries = self._snapshot
+        results, seen = [], set()
+        i = bisect.bisect_left(keys, prefix)
+        scanned = 0
+        while i < len(keys) and keys[i].startswith(prefix) and scanned < limit * 8:
+            _, kind, ref, label = entries[i]
+            if (kind, ref) not in seen and (kinds is None or kind in kinds):
+                seen.add((kind, ref))
+                results.append((kind, ref, label))
+                if len(results) >= limit:
+                    break
+            i += 1
+            scanned += 1
+        return results
+
+
+suggest_index = PrefixIndex()
+
+
+# -----------------------
+# Feeding the index
+# -----------------------
+
+def _post_entries(post_id, title):
+    return [(key, "post", post_id, title) for key in _title_keys(title)]
+
+
+def build_entries():
+    """
+    Streams (key, kind, ref, label) for every category, username and post
+    title, in budget priority order: categories and users are few and all
+    kept, then posts newest first so a full index drops the oldest titles.
+    Only the needed columns are read.
+    """
+    for slug, name in db.session.query(Category.slug, Category.name):
+        yield (_normalize(name), "category", slug, name)
+    for (username,) in db.session.query(User.username).yield_per(1000):
+        yield (_normalize(username), "user", username, username)
+    for post_id, title in db.session.query(Post.id, Post.title).order_by(Post.id.desc()).yield_per(1000):
+        yield from _post_entries(post_id, title)
+
+
+def rebuild_suggest_index():
+    suggest_index.rebuild(build_entries())
+    logger.info("Suggest index rebuilt with %d entries.", len(suggest_index))
+
+
+def add_post(post: Post):
+    suggest_index.add_many(_post_entries(post.id, post.title))
+
+
+def remove_post(post_id: int):
+    suggest_index.remove("post", post_id)
+
+
+def add_user(user: User):
+    suggest_index.add(user.username, "user", user.username, user.username)
+
+
+def remove_user(username: str):
+    suggest_index.remove("user", username)
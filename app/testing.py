@@ -0,0 +1,56 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from . import db
+
+
+@contextmanager
+def count_queries(engine=None):
+    """
+    Collects every SQL statement executed inside the block.
+
+        with count_queries() as statements:
+            client.get("/")
+        print(len(statements))
+    """
+    engine = engine or db.engine
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int, engine=None):
+    """
+    Fails if the block runs more than `max_queries` statements (N+1 guard).
+
+        with assert_max_queries(4):
+            client.get("/blogs")
+    """
+    with count_queries(engine) as statements:
+        yield statements
+    if len(statements) > max_queries:
+        listing = "\n".join(f"  {i + 1}. {s}" for i, s in enumerate(statements))
+        raise AssertionError(
+            f"Expected at most {max_queries} queries, got {len(statements)}:\n{listing}"
+        )
+
+
+def assert_route_queries(client, url: str, max_queries: int, method: str = "GET",
+                         engine=None, **kwargs):
+    """
+    Requests `url` with a Flask test client and checks its query budget.
+    Pass `engine` when calling outside an app context. Returns the response.
+    """
+    with assert_max_queries(max_queries, engine):
+        response = client.open(url, method=method, **kwargs)
+    assert response.status_code < 500, f"{url} returned {response.status_code}"
+    return response
@@ -0,0 +1,224 @@
+import os
+import gzip
+import json
+import base64
+import logging
+from datetime import datetime, date
+
+from sqlalchemy import select, func, text, tuple_
+
+from . import db
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+STATE_FILE = ".import-state.json"
+BATCH_SIZE = 1000
+
+# Rebuildable from the other tables (flask rebuild-related); only exported when asked for.
+DERIVED_TABLES = {"post_vector", "post_term", "related_post"}
+
+
+def _tables(names=None):
+    """
+    Tables in foreign-key order (parents first), so imports never hit a
+    missing parent row.
+    """
+    tables = db.metadata.sorted_tables
+    if names:
+        unknown = set(names) - {t.name for t in tables}
+        if unknown:
+            raise ValueError(f"Unknown table(s): {', '.join(sorted(unknown))}")
+        return [t for t in tables if t.name in names]
+    return [t for t in tables if t.name not in DERIVED_TABLES]
+
+
+def _path(directory, table):
+    return os.path.join(directory, f"{table.name}.jsonl.gz")
+
+
+# -----------------------
+# (De)serializing values
+# -----------------------
+
+def encode_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return base64.b64encode(bytes(value)).decode("ascii")
+    return value
+
+
+def _decoders(table):
+    decoders = {}
+    for column in table.columns:
+        python_type = None
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            pass
+        if python_type is datetime:
+            decoders[column.name] = datetime.fromisoformat
+        elif python_type is date:
+            decoders[column.name] = date.fromisoformat
+        elif python_type is bytes:
+            decoders[column.name] = base64.b64decode
+    return decoders
+
+
+def _decode(row: dict, decoders: dict) -> dict:
+    for name, decode in decoders.items():
+        if row.get(name) is not None:
+            row[name] = decode(row[name])
+    return row
+
+
+# -----------------------
+# Export
+# -----------------------
+
+def export_tables(directory, names=None, batch_size: int = BATCH_SIZE, progress=None) -> dict:
+    """
+    Streams each table to <directory>/<table>.jsonl.gz in primary-key order.
+    Rows are fetched with a server-side cursor `batch_size` at a time and
+    written straight to gzip, so memory stays flat whatever the table size.
+    Returns {table: rows}; also written to manifest.json.
+    """
+    os.makedirs(directory, exist_ok=True)
+    counts = {}
+    connection = db.session.connection().execution_options(stream_results=True, yield_per=batch_size)
+
+    for table in _tables(names):
+        total = connection.execute(select(func.count()).select_from(table)).scalar()
+        stmt = select(table).order_by(*table.primary_key.columns)
+        written = 0
+        with gzip.open(_path(directory, table), "wt", encoding="utf-8") as fh:
+            for batch in connection.execute(stmt).mappings().partitions(batch_size):
+                for row in batch:
+                    fh.write(json.dumps({k: encode_value(v) for k, v in row.items()}, ensure_ascii=False))
+                    fh.write("\n")
+                written += len(batch)
+                if progress:
+                    progress(table.name, written, total)
+        counts[table.name] = written
+        logger.info("Exported %d rows from %s.", written, table.name)
+
+    with open(os.path.join(directory, MANIFEST), "w", encoding="utf-8") as fh:
+        json.dump({
+            "exported_at": datetime.utcnow().isoformat(),
+            "tables": [{"name": name, "rows": rows} for name, rows in counts.items()],
+        }, fh, indent=2)
+    db.session.rollback()   # release the read transaction
+    return counts
+
+
+# -----------------------
+# Import
+# -----------------------
+
+def _load_state(directory) -> dict:
+    path = os.path.join(directory, STATE_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def _save_state(directory, state: dict):
+    path = os.path.join(directory, STATE_FILE)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(state, fh)
+    os.replace(tmp, path)   # never leave a half-written state file
+
+
+def _reset_sequence(table):
+    """
+    PostgreSQL keeps its own id counters; move them past the imported ids.
+    """
+    if db.engine.dialect.name != "postgresql" or "id" not in table.columns:
+        return
+    db.session.execute(text(
+        f"SELECT setval(pg_get_serial_sequence('\"{table.name}\"', 'id'), "
+        f"COALESCE((SELECT MAX(id) FROM \"{table.name}\"), 1))"
+    ))
+
+
+def _without_existing(table, rows: list) -> list:
+    """
+    Drops rows whose primary key is already in `table`, so replaying a
+    committed batch on resume is a no-op rather than a duplicate-key error.
+    """
+    pk = list(table.primary_key.columns)
+    key = lambda row: tuple(row[c.name] for c in pk)   # noqa: E731
+    keys = [key(row) for row in rows]
+    if len(pk) == 1:
+        clause = pk[0].in_([k[0] for k in keys])
+    else:
+        clause = tuple_(*pk).in_(keys)
+    existing = {tuple(r) for r in db.session.execute(select(*pk).where(clause))}
+    return [row for row in rows if key(row) not in existing]
+
+
+def import_tables(directory, names=None, batch_size: int = BATCH_SIZE,
+                  resume: bool = False, progress=None) -> dict:
+    """
+    Loads an export back in foreign-key order with batched executemany
+    INSERTs, committing each batch. Progress per table is checkpointed to
+    .import-state.json so `resume=True` skips ahead to the last recorded
+    batch; the checkpoint is written after the commit, so it can lag one
+    batch behind (or be missing), and resume also skips rows whose primary
+    key already exists. Without `resume`, tables that already hold rows are
+    refused. Returns {table: rows inserted this run}.
+    """
+    db.create_all()
+    state = _load_state(directory) if resume else {}
+    manifest_path = os.path.join(directory, MANIFEST)
+    expected = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as fh:
+            expected = {t["name"]: t["rows"] for t in json.load(fh)["tables"]}
+
+    tables = [t for t in _tables(names or list(expected) or None) if os.path.exists(_path(directory, t))]
+    if not resume:
+        for table in tables:
+            if db.session.execute(select(func.count()).select_from(table)).scalar():
+                raise RuntimeError(f"Table {table.name} is not empty; use resume or an empty database.")
+
+    inserted = {}
+    for table in tables:
+        done = state.get(table.name, 0)
+        decoders = _decoders(table)
+        count = 0
+        batch = []
+
+        def flush():
+            nonlocal done, count
+            rows = _without_existing(table, batch) if resume else batch
+            if rows:
+                db.session.execute(table.insert(), rows)
+            db.session.commit()
+            done += len(batch)
+            count += len(rows)
+            state[table.name] = done
+            _save_state(directory, state)
+            batch.clear()
+            if progress:
+                progress(table.name, done, expected.get(table.name))
+
+        with gzip.open(_path(directory, table), "rt", encoding="utf-8") as fh:
+            for line_no, line in enumerate(fh):
+                if line_no < done:
+                    continue   # already committed by an earlier run
+                batch.append(_decode(json.loads(line), decoders))
+                if len(batch) >= batch_size:
+                    flush()
+            if batch:
+                flush()
+
+        _reset_sequence(table)
+        db.session.commit()
+        inserted[table.name] = count
+        logger.info("Imported %d rows into %s (%d total).", count, table.name, done)
+
+    return inserted
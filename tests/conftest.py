@@ -0,0 +1,38 @@
+import pytest
+
+from app import create_app, db
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    """
+    The real app on an in-memory database, no background jobs.
+    No app context is left pushed, so every test-client request gets a
+    fresh one (as in production); use `with app.app_context()` to seed.
+    """
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    flask_app = create_app(start_scheduler=False)
+    flask_app.config.update(TESTING=True, RETENTION_ARCHIVE_DIR=str(tmp_path / "archive"))
+    with flask_app.app_context():
+        db.create_all()
+    yield flask_app
+    with flask_app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def engine(app):
+    with app.app_context():
+        return db.engine
+
+
+def login(client, user_id: int):
+    with client.session_transaction() as session:
+        session["_user_id"] = str(user_id)
+        session["_fresh"] = True
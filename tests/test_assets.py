@@ -0,0 +1,147 @@
+import gzip
+import os
+import time
+
+import pytest
+from flask import Flask, url_for
+
+from app.assets import IMMUTABLE_MAX_AGE, brotli, build_assets, init_assets, load_manifest, prune_assets
+
+CSS = "body { color: #123456; }\n" * 200
+
+
+@pytest.fixture
+def static(tmp_path):
+    folder = tmp_path / "static"
+    (folder / "css").mkdir(parents=True)
+    (folder / "uploads").mkdir()
+    (folder / "css" / "style.css").write_text(CSS)
+    (folder / "logo.png").write_bytes(os.urandom(512))
+    (folder / "uploads" / "avatar.png").write_bytes(b"user upload")
+    return folder
+
+
+def _app(static_folder):
+    app = Flask(__name__, static_folder=str(static_folder))
+    init_assets(app)
+    return app
+
+
+def _get(app, path, accept=None):
+    headers = {"Accept-Encoding": accept} if accept is not None else {}
+    return app.test_client().get(path, headers=headers)
+
+
+def _style_url(app):
+    with app.test_request_context():
+        return url_for("static", filename="css/style.css")
+
+
+def test_without_a_build_nothing_changes(static):
+    app = _app(static)
+
+    assert _style_url(app) == "/static/css/style.css"
+    response = _get(app, "/static/css/style.css", accept="gzip, br")
+    assert response.data.decode() == CSS
+    assert "Content-Encoding" not in response.headers
+    assert "immutable" not in response.headers.get("Cache-Control", "")
+
+
+def test_build_writes_manifest_and_url_for_uses_it(static):
+    manifest = build_assets(str(static))
+    app = _app(static)
+
+    assert set(manifest) == {"css/style.css", "logo.png"}
+    assert manifest == load_manifest(str(static))
+    url = _style_url(app)
+    assert url.startswith("/static/dist/css/style.") and url.endswith(".css")
+    assert url == "/static/" + manifest["css/style.css"]
+    assert (static / manifest["css/style.css"]).read_text() == CSS
+
+
+@pytest.mark.parametrize("accept, encoding", [
+    ("br, gzip", "br"),
+    ("gzip", "gzip"),
+    ("gzip, br;q=0", "gzip"),
+    ("*;q=0, br", "br"),
+    ("*", "br"),
+    ("gzip;q=0", None),
+    ("identity", None),
+    ("", None),
+    ("gzip;q=bogus", None),
+])
+def test_encoding_negotiation(static, accept, encoding):
+    if encoding == "br" and brotli is None:
+        pytest.skip("brotli not installed")
+    build_assets(str(static))
+    app = _app(static)
+
+    response = _get(app, _style_url(app), accept=accept)
+
+    assert response.status_code == 200
+    assert response.headers.get("Content-Encoding") == encoding
+    if encoding == "gzip":
+        assert gzip.decompress(response.data).decode() == CSS
+    elif encoding == "br":
+        assert brotli.decompress(response.data).decode() == CSS
+    else:
+        assert response.data.decode() == CSS
+    assert response.mimetype == "text/css"
+
+
+def test_fingerprinted_assets_are_cached_immutably(static):
+    build_assets(str(static))
+    app = _app(static)
+
+    response = _get(app, _style_url(app), accept="gzip")
+
+    cache_control = response.headers["Cache-Control"]
+    assert "immutable" in cache_control
+    assert "public" in cache_control
+    assert f"max-age={IMMUTABLE_MAX_AGE}" in cache_control
+    assert "Accept-Encoding" in response.headers["Vary"]
+
+
+def test_binary_assets_are_not_precompressed(static):
+    manifest = build_assets(str(static))
+
+    assert not (static / (manifest["logo.png"] + ".gz")).exists()
+
+
+def test_rebuild_keeps_old_fingerprints_for_running_servers(static):
+    build_assets(str(static))
+    running = _app(static)
+    old_url = _style_url(running)
+
+    (static / "css" / "style.css").write_text(CSS + "a { color: red; }\n")
+    build_assets(str(static))
+    restarted = _app(static)
+    new_url = _style_url(restarted)
+
+    assert new_url != old_url
+    assert _get(running, old_url, accept="gzip").status_code == 200
+    assert _get(restarted, old_url).status_code == 200
+    assert _get(restarted, new_url).status_code == 200
+    assert not list(static.rglob("*.tmp"))
+
+
+def test_prune_removes_only_old_superseded_files(static):
+    build_assets(str(static))
+    old = static / load_manifest(str(static))["css/style.css"]
+    (static / "css" / "style.css").write_text(CSS + "a { color: red; }\n")
+    build_assets(str(static))
+    current = static / load_manifest(str(static))["css/style.css"]
+
+    assert prune_assets(str(static), older_than_days=7) == 0
+
+    week_ago = time.time() - 8 * 24 * 3600
+    for path in static.joinpath("dist").rglob("*"):
+        if path.is_file():
+            os.utime(path, (week_ago, week_ago))
+    removed = prune_assets(str(static), older_than_days=7)
+
+    assert removed >= 2   # the old css and its .gz (and .br)
+    assert not old.exists()
+    assert not (static / (str(old) + ".gz")).exists()
+    assert current.exists()
+    assert (static / "dist" / "manifest.json").exists()
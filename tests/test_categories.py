@@ -0,0 +1,133 @@
+import pytest
+
+from app import db
+from app.categories import (assign_category, ensure_default_categories, get_category,
+                            get_or_create_category, normalize_post_categories, slugify)
+from app.models import Category, Post, User
+
+from conftest import login
+
+
+@pytest.mark.parametrize("name, slug", [
+    ("Computing & Hardware", "computing-hardware"),
+    ("  Tech   Innovations ", "tech-innovations"),
+    ("C", "c"),
+    ("C#", "c-sharp"),
+    ("C++", "c-plus-plus"),
+    ("Café Culture", "cafe-culture"),
+    ("Программирование", ""),
+    ("🚀", ""),
+])
+def test_slugify(name, slug):
+    assert slugify(name) == slug
+
+
+def _user():
+    user = User(username="author", email="author@example.com", password_hash="x", is_admin=True)
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def _count(name):
+    return Category.query.filter_by(name=name).one().post_count
+
+
+def test_distinct_names_get_distinct_categories(app):
+    with app.app_context():
+        names = ["C", "C#", "C++", "Программирование", "Данные", "🚀", "🔥"]
+        categories = [get_or_create_category(name) for name in names]
+        db.session.commit()
+
+        assert len({c.id for c in categories}) == len(names)
+        slugs = [c.slug for c in categories]
+        assert len(set(slugs)) == len(names)
+        assert all(slugs)
+        assert slugs[:3] == ["c", "c-sharp", "c-plus-plus"]
+        assert slugs[3] == f"category-{categories[3].id}"
+
+
+def test_lookup_by_slug_or_name(app):
+    with app.app_context():
+        created = get_or_create_category("Artificial Intelligence")
+        db.session.commit()
+
+        assert get_category("artificial-intelligence").id == created.id
+        assert get_category("artificial intelligence").id == created.id
+        assert get_or_create_category("  ARTIFICIAL   intelligence ").id == created.id
+        assert get_category("") is None
+        assert get_category("unknown") is None
+
+
+def test_colliding_slugs_are_suffixed(app):
+    with app.app_context():
+        first = get_or_create_category("Dev Ops")
+        second = get_or_create_category("Dev-Ops")
+        db.session.commit()
+
+        assert (first.slug, second.slug) == ("dev-ops", "dev-ops-2")
+
+
+def test_category_page_for_non_ascii_name(app, client):
+    with app.app_context():
+        slug = get_or_create_category("Программирование").slug
+        db.session.commit()
+
+    assert client.get(f"/category/{slug}").status_code == 200
+
+
+def test_post_count_follows_assign_and_admin_delete(app, client):
+    with app.app_context():
+        user = _user()
+        news, ai = get_or_create_category("News"), get_or_create_category("AI")
+        posts = [Post(title=f"t{i}", summary="s", user_id=user.id) for i in range(3)]
+        for post in posts:
+            assign_category(post, news)
+            db.session.add(post)
+        db.session.commit()
+        assert (_count("News"), _count("AI")) == (3, 0)
+
+        assign_category(posts[0], ai)
+        assign_category(posts[0], ai)   # no-op
+        db.session.commit()
+        assert (_count("News"), _count("AI")) == (2, 1)
+        user_id, post_id = user.id, posts[1].id
+
+    login(client, user_id)
+    client.post(f"/admin/posts/{post_id}/delete")
+
+    with app.app_context():
+        assert db.session.get(Post, post_id) is None
+        assert (_count("News"), _count("AI")) == (1, 1)
+
+
+def test_normalize_post_categories_keeps_distinct_names_apart(app):
+    with app.app_context():
+        user = _user()
+        raw = ["C", "C#", "C++", "ai ", "AI", "Программирование", "Данные", "🚀", None]
+        db.session.add_all([Post(title=f"t{i}", summary="s", user_id=user.id, category=c)
+                            for i, c in enumerate(raw)])
+        db.session.add(Category(name="Legacy", slug="", post_count=0))   # pre-fix row
+        db.session.commit()
+
+        assert normalize_post_categories() == len(raw)
+        db.session.commit()
+
+        by_title = {p.title: p for p in Post.query.all()}
+        ids = [by_title[f"t{i}"].category_id for i in range(len(raw))]
+        assert None not in ids
+        assert len({ids[0], ids[1], ids[2]}) == 3
+        assert ids[3] == ids[4]
+        assert len({ids[5], ids[6], ids[7]}) == 3
+        assert db.session.get(Category, ids[8]).name == "General"
+        assert Category.query.filter_by(slug="").count() == 0
+        assert sum(c.post_count for c in Category.query.all()) == len(raw)
+
+
+def test_default_categories_are_idempotent(app):
+    with app.app_context():
+        ensure_default_categories()
+        ensure_default_categories()
+        db.session.commit()
+
+        assert Category.query.count() == 7
@@ -0,0 +1,38 @@
+import pytest
+from click.testing import CliRunner
+from flask.cli import FlaskGroup
+
+from app import create_app
+
+
+@pytest.fixture
+def scheduled(monkeypatch):
+    """
+    Records scheduler starts instead of starting real background jobs.
+    """
+    calls = []
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    monkeypatch.setattr("app._schedule_jobs", lambda app: calls.append("jobs"))
+    monkeypatch.setattr("app.scheduler.start", lambda: calls.append("start"))
+    return calls
+
+
+@pytest.mark.parametrize("args", [
+    ["export-data", "--help"],
+    ["apply-retention", "--help"],
+    ["routes"],
+    ["--help"],
+])
+def test_cli_commands_never_start_the_scheduler(scheduled, args):
+    cli = FlaskGroup(create_app=lambda: create_app())
+
+    result = CliRunner().invoke(cli, args, catch_exceptions=False)
+
+    assert result.exit_code == 0, result.output
+    assert scheduled == []
+
+
+def test_create_app_schedules_outside_the_cli(scheduled):
+    create_app()
+
+    assert scheduled == ["jobs", "start"]
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import app.hot as hot
+from app import db
+from app.hot import HOT_HALF_LIFE_HOURS, decay_hot_scores, record_like
+from app.models import Post, User
+
+
+@pytest.fixture
+def post_id(app):
+    with app.app_context():
+        user = User(username="author", email="author@example.com", password_hash="x")
+        db.session.add(user)
+        db.session.commit()
+        post = Post(title="t", summary="s", user_id=user.id)
+        db.session.add(post)
+        db.session.commit()
+        return post.id
+
+
+def _score(post_id):
+    db.session.expire_all()
+    post = db.session.get(Post, post_id)
+    return post.hot_score, post.hot_updated_at
+
+
+def _set(post_id, score, updated_at):
+    Post.query.filter_by(id=post_id).update(
+        {Post.hot_score: score, Post.hot_updated_at: updated_at}, synchronize_session=False)
+    db.session.commit()
+
+
+def _interleave(monkeypatch, write):
+    """
+    Runs `write()` once, between the first read of hot_updated_at and the
+    guarded UPDATE (the decay factor is computed in between).
+    """
+    calls = []
+    real = hot._decay_factor
+
+    def factor(seconds):
+        calls.append(seconds)
+        if len(calls) == 1:
+            write()
+        return real(seconds)
+
+    monkeypatch.setattr(hot, "_decay_factor", factor)
+    return calls
+
+
+def test_like_then_unlike_returns_to_zero(app, post_id):
+    with app.app_context():
+        liked_at = datetime.utcnow()
+        record_like(post_id, liked_at, liked=True)
+        db.session.commit()
+        assert _score(post_id)[0] == pytest.approx(1.0, abs=1e-3)
+
+        record_like(post_id, liked_at, liked=False)
+        db.session.commit()
+        assert _score(post_id)[0] == pytest.approx(0.0, abs=1e-3)
+
+
+def test_decay_halves_after_one_half_life(app, post_id):
+    with app.app_context():
+        _set(post_id, 2.0, datetime.utcnow() - timedelta(hours=HOT_HALF_LIFE_HOURS))
+
+        assert decay_hot_scores() == 1
+        assert _score(post_id)[0] == pytest.approx(1.0, rel=1e-3)
+
+
+def test_record_like_retries_when_the_row_changes_underneath(app, post_id, monkeypatch):
+    with app.app_context():
+        _set(post_id, 0.0, None)
+        changed_at = datetime.utcnow()
+        calls = _interleave(monkeypatch, lambda: _set(post_id, 4.0, changed_at))
+
+        record_like(post_id, datetime.utcnow(), liked=True)
+        db.session.commit()
+
+        # first attempt missed the guard, the retry built on the concurrent write
+        assert len(calls) >= 3
+        assert _score(post_id)[0] == pytest.approx(5.0, abs=1e-3)
+
+
+def test_decay_retries_rows_changed_by_an_older_write(app, post_id, monkeypatch):
+    with app.app_context():
+        day_ago = datetime.utcnow() - timedelta(hours=HOT_HALF_LIFE_HOURS)
+        _set(post_id, 8.0, day_ago - timedelta(hours=HOT_HALF_LIFE_HOURS))
+        _interleave(monkeypatch, lambda: _set(post_id, 2.0, day_ago))
+
+        decay_hot_scores()
+
+        score, updated_at = _score(post_id)
+        assert score == pytest.approx(1.0, rel=1e-3)
+        assert updated_at > day_ago
+
+
+def test_decay_leaves_rows_a_like_moved_past_it(app, post_id, monkeypatch):
+    with app.app_context():
+        _set(post_id, 2.0, datetime.utcnow() - timedelta(hours=HOT_HALF_LIFE_HOURS))
+        liked = {}
+
+        def like():
+            record_like(post_id, datetime.utcnow(), liked=True)
+            db.session.commit()
+            liked["at"] = _score(post_id)[1]
+
+        _interleave(monkeypatch, like)
+
+        decay_hot_scores()
+
+        score, updated_at = _score(post_id)
+        # the like's decay-to-now stands; the timestamp is not moved backwards
+        assert updated_at == liked["at"]
+        assert score == pytest.approx(2.0, rel=1e-3)
@@ -0,0 +1,106 @@
+import json
+import time
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.ingest import NewsSource, make_http_client, run_cycle
+from app.models import TrendingStory
+
+SLOW_SECONDS = 3.0
+
+
+def _articles(*slugs):
+    return {"articles": [{
+        "title": f"Linux kernel news: {slug}",
+        "description": f"GPU driver update {slug}",
+        "url": f"https://news.example.com/{slug}",
+    } for slug in slugs]}
+
+
+ROUTES = {
+    "/healthy": (200, json.dumps(_articles("one", "two"))),
+    "/overlap": (200, json.dumps(_articles("two", "three"))),
+    "/error": (500, "internal error"),
+    "/invalid": (200, "{not json"),
+    "/slow": (200, json.dumps(_articles("late"))),
+}
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/slow":
+            time.sleep(SLOW_SECONDS)
+        status, body = ROUTES[path]
+        data = body.encode("utf-8")
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass   # client gave up (deadline)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def stub_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.block_on_close = False
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _sources(base, *paths):
+    return [NewsSource(path.strip("/"), base + path) for path in paths]
+
+
+def _run(app, sources, deadline=5.0):
+    async def cycle():
+        async with make_http_client() as http_client:
+            return await run_cycle(app, sources, http_client, deadline=deadline)
+    return asyncio.run(cycle())
+
+
+def _stored_urls(app):
+    with app.app_context():
+        return sorted(url for (url,) in TrendingStory.query.with_entities(TrendingStory.source_url))
+
+
+def test_failing_and_slow_sources_do_not_block_healthy_ones(app, stub_url):
+    started = time.monotonic()
+    written = _run(app, _sources(stub_url, "/healthy", "/error", "/slow"), deadline=0.5)
+    elapsed = time.monotonic() - started
+
+    assert written == 2
+    assert elapsed < SLOW_SECONDS
+    assert _stored_urls(app) == ["https://news.example.com/one", "https://news.example.com/two"]
+
+
+def test_invalid_json_is_skipped(app, stub_url):
+    assert _run(app, _sources(stub_url, "/invalid")) == 0
+    assert _run(app, _sources(stub_url, "/invalid", "/healthy")) == 2
+    assert len(_stored_urls(app)) == 2
+
+
+def test_second_cycle_skips_known_source_urls(app, stub_url):
+    assert _run(app, _sources(stub_url, "/healthy")) == 2
+    assert _run(app, _sources(stub_url, "/healthy")) == 0
+    assert _run(app, _sources(stub_url, "/healthy", "/overlap")) == 1
+
+    assert _stored_urls(app) == [
+        "https://news.example.com/one",
+        "https://news.example.com/three",
+        "https://news.example.com/two",
+    ]
+    with app.app_context():
+        assert all(s.description.startswith("GPU driver update") for s in TrendingStory.query)
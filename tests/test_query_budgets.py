@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.categories import ensure_default_categories
+from app.hot import rebuild_hot_scores
+from app.models import Category, Like, Post, User
+from app.related import rebuild_related
+from app.rendering import render_post
+from app.testing import assert_route_queries
+
+from conftest import login
+
+# Statements per page, including the logged-in user's load. These must not
+# grow with the number of posts, likes or users on the page (no N+1).
+BUDGETS = {
+    "/": 4,
+    "/hot": 3,
+    "/blogs": 2,
+    "/category/{slug}": 4,
+    "/post/{post_id}": 3,
+    "/admin/posts": 2,
+    "/admin/users": 2,
+}
+
+
+@pytest.fixture
+def seeded(app):
+    with app.app_context():
+        ensure_default_categories()
+        categories = Category.query.all()
+        users = [User(username=f"user{i}", email=f"user{i}@example.com", password_hash="x",
+                      is_admin=(i == 0)) for i in range(6)]
+        db.session.add_all(users)
+        db.session.commit()
+
+        now = datetime.utcnow()
+        for i in range(30):
+            category = categories[i % len(categories)]
+            post = Post(title=f"Post {i} about linux kernels and gpus", summary="summary",
+                        content=f"Body {i} of the post, with **markdown**.",
+                        user_id=users[i % len(users)].id, category=category.name,
+                        category_id=category.id, status="published",
+                        date_posted=now - timedelta(hours=i))
+            render_post(post)
+            db.session.add(post)
+        db.session.commit()
+
+        posts = Post.query.order_by(Post.id).all()
+        ids = {"admin_id": users[0].id, "slug": categories[0].slug, "post_id": posts[0].id}
+        db.session.add_all([
+            Like(user_id=user.id, post_id=post.id, created_at=now - timedelta(hours=j))
+            for j, post in enumerate(posts[:10]) for user in users
+        ])
+        db.session.commit()
+        rebuild_hot_scores()
+        rebuild_related()
+        return ids
+
+
+@pytest.mark.parametrize("route", list(BUDGETS))
+def test_route_query_budget(client, engine, seeded, route):
+    login(client, seeded["admin_id"])
+    url = route.format(slug=seeded["slug"], post_id=seeded["post_id"])
+
+    response = assert_route_queries(client, url, BUDGETS[route], engine=engine)
+
+    assert response.status_code == 200
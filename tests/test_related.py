@@ -0,0 +1,98 @@
+import random
+from collections import defaultdict
+
+import pytest
+
+from app import db
+from app.models import Post, PostVector, RelatedPost, User
+from app.related import TOP_K, index_pending, rebuild_related, related_posts
+
+VOCABULARY = """
+linux kernel scheduler gpu cuda driver nvidia amd chip silicon malware exploit
+ransomware patch windows android iphone battery camera python rust compiler
+cloud kubernetes docker cluster robot automation vision model training dataset
+""".split()
+
+
+def _text(rng):
+    return " ".join(rng.choice(VOCABULARY[rng.randrange(0, 30, 6):][:12]) for _ in range(rng.randint(8, 20)))
+
+
+@pytest.fixture
+def corpus(app):
+    rng = random.Random(7)
+    with app.app_context():
+        user = User(username="author", email="author@example.com", password_hash="x")
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+        db.session.add_all([
+            Post(title=_text(rng)[:60], summary=_text(rng), content=_text(rng), user_id=user_id)
+            for _ in range(40)
+        ])
+        db.session.commit()
+        rebuild_related()
+        return user_id
+
+
+def _neighbours(post_id):
+    return {r.related_id: r.score for r in RelatedPost.query.filter_by(post_id=post_id)}
+
+
+def _assert_lists_well_formed(k=TOP_K):
+    ranks = defaultdict(list)
+    for row in RelatedPost.query.all():
+        ranks[row.post_id].append(row.rank)
+    for post_id, post_ranks in ranks.items():
+        assert len(post_ranks) <= k, post_id
+        assert sorted(post_ranks) == list(range(len(post_ranks))), post_id
+
+
+def test_index_pending_matches_a_full_rebuild(app, corpus):
+    with app.app_context():
+        # a near-duplicate of an existing post, so it enters that post's list too
+        original = db.session.get(Post, 1)
+        post = Post(title=original.title, summary=original.summary, user_id=corpus,
+                    content=original.content + " gpu driver")
+        db.session.add(post)
+        db.session.commit()
+        post_id, original_id = post.id, original.id
+        assert db.session.get(PostVector, post_id) is None
+
+        assert index_pending() == 1
+        assert index_pending() == 0
+        incremental = _neighbours(post_id)
+        pushed_into = {r.post_id for r in RelatedPost.query.filter_by(related_id=post_id)}
+
+        assert len(incremental) == TOP_K
+        assert original_id in pushed_into
+        assert max(incremental, key=incremental.get) == original_id
+        _assert_lists_well_formed()
+        assert [p.id for p in related_posts(post_id)] == sorted(incremental, key=incremental.get, reverse=True)
+
+        rebuild_related()
+        rebuilt = _neighbours(post_id)
+
+    # same neighbours in the same order; scores differ only by the idf drift
+    # in the other posts' stored norms
+    assert sorted(incremental, key=incremental.get) == sorted(rebuilt, key=rebuilt.get)
+    for related_id, score in incremental.items():
+        assert score == pytest.approx(rebuilt[related_id], abs=1e-2)
+
+
+def test_rebuild_keeps_k_contiguous_ranks(app, corpus):
+    with app.app_context():
+        _assert_lists_well_formed()
+        assert RelatedPost.query.count() > 0
+        assert RelatedPost.query.filter(RelatedPost.post_id == RelatedPost.related_id).count() == 0
+
+
+def test_reindexing_many_posts_keeps_lists_bounded(app, corpus):
+    rng = random.Random(11)
+    with app.app_context():
+        db.session.add_all([Post(title=_text(rng)[:60], summary=_text(rng), content=_text(rng),
+                                 user_id=corpus) for _ in range(15)])
+        db.session.commit()
+
+        assert index_pending() == 15
+        _assert_lists_well_formed()
@@ -0,0 +1,50 @@
+import pytest
+
+from app.rendering import is_safe_url, render_html
+
+
+@pytest.mark.parametrize("source", [
+    "[a](javascript:alert(1))",
+    "[a](JaVaScRiPt:alert(1))",
+    "[a](&#106;avascript:alert(1))",
+    "[a](&#x6A;avascript:alert(1))",
+    "[a](javascript&colon;alert(1))",
+    "[a](java&#9;script:alert(1))",
+    "[a](&#32;javascript:alert(1))",
+    "![x](&#100;ata:text/html,<script>alert(1)</script>)",
+    "![x](vbscript:msgbox(1))",
+])
+def test_unsafe_link_schemes_are_dropped(source):
+    rendered = render_html(source)
+
+    assert "href=" not in rendered
+    assert "src=" not in rendered
+
+
+@pytest.mark.parametrize("source, attribute", [
+    ("[a](https://example.com/?a=1&b=2)", 'href="https://example.com/?a=1&amp;b=2"'),
+    ("[a](/post/1)", 'href="/post/1"'),
+    ("[a](#section)", 'href="#section"'),
+    ("![x](/static/uploads/posts/x.png)", 'src="/static/uploads/posts/x.png"'),
+])
+def test_safe_links_are_kept(source, attribute):
+    assert attribute in render_html(source)
+
+
+def test_raw_html_is_escaped():
+    rendered = render_html('<img src=x onerror="alert(1)"> <script>alert(1)</script>')
+
+    assert "<script" not in rendered
+    assert "<img" not in rendered
+
+
+@pytest.mark.parametrize("url, safe", [
+    ("http://example.com", True),
+    ("mailto:someone@example.com", True),
+    ("relative/path:with-colon", True),
+    ("&#x6A;avascript:alert(1)", False),
+    ("\x01javascript:alert(1)", False),
+    ("data:text/html,hi", False),
+])
+def test_is_safe_url(url, safe):
+    assert is_safe_url(url) is safe
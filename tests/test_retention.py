@@ -0,0 +1,56 @@
+import gzip
+import json
+from datetime import datetime, timedelta
+
+from app import db
+from app.models import TrendingStory
+from app.retention import apply_retention
+
+
+def _seed_stories(count: int, days_old: int = 90):
+    start = datetime.utcnow() - timedelta(days=days_old)
+    db.session.add_all([
+        TrendingStory(title=f"story {i}", description="d", source_url=f"https://example.com/{i}",
+                      date_posted=start + timedelta(minutes=i))
+        for i in range(count)
+    ])
+    db.session.commit()
+
+
+def test_default_policy_keeps_up_to_200_stories_of_any_age(app, monkeypatch):
+    monkeypatch.delenv("RETENTION_TRENDING_DAYS", raising=False)
+    with app.app_context():
+        _seed_stories(142)
+
+        results = apply_retention()
+
+        assert results["trending_story"] == 0
+        assert TrendingStory.query.count() == 142
+
+
+def test_default_policy_trims_to_the_newest_200_and_archives(app, monkeypatch, tmp_path):
+    monkeypatch.delenv("RETENTION_TRENDING_DAYS", raising=False)
+    with app.app_context():
+        _seed_stories(250)
+
+        results = apply_retention(archive_dir=str(tmp_path))
+
+        assert results["trending_story"] == 50
+        assert TrendingStory.query.count() == 200
+        archived = []
+        for path in (tmp_path / "trending_story").glob("*.jsonl.gz"):
+            with gzip.open(path, "rt", encoding="utf-8") as fh:
+                archived.extend(json.loads(line)["title"] for line in fh)
+        assert sorted(archived) == sorted(f"story {i}" for i in range(50))
+
+
+def test_age_limit_applies_when_configured(app, monkeypatch):
+    monkeypatch.setenv("RETENTION_TRENDING_DAYS", "30")
+    with app.app_context():
+        _seed_stories(10, days_old=90)
+        _seed_stories(5, days_old=1)
+
+        results = apply_retention()
+
+        assert results["trending_story"] == 10
+        assert TrendingStory.query.count() == 5
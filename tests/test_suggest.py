@@ -0,0 +1,118 @@
+import pytest
+
+from app import db
+from app.models import Category, Post, User
+from app.suggest import (PrefixIndex, build_entries, rebuild_suggest_index, suggest_index,
+                         _ENTRY_OVERHEAD)
+
+from conftest import login
+
+
+def _index(*titles):
+    index = PrefixIndex()
+    index.rebuild((key, "post", i, title) for i, title in enumerate(titles, 1)
+                  for key in [" ".join(title.lower().split()[j:]) for j in range(len(title.split()))])
+    return index
+
+
+def test_prefix_lookup_matches_any_word():
+    index = _index("Linux kernel release", "GPU chips", "Kernel exploit found")
+
+    assert index.lookup("li") == [("post", 1, "Linux kernel release")]
+    assert [ref for _, ref, _ in index.lookup("KER")] == [3, 1]
+    assert index.lookup("kernel rel") == [("post", 1, "Linux kernel release")]
+    assert index.lookup("zzz") == []
+    assert index.lookup("   ") == []
+
+
+def test_lookup_deduplicates_and_limits():
+    index = _index("rust rust rust", "rust in production", "rusty tools")
+
+    results = index.lookup("rust")
+    assert [ref for _, ref, _ in results] == [1, 2, 3]
+    assert len(index.lookup("rust", limit=2)) == 2
+
+
+def test_lookup_by_kind():
+    index = PrefixIndex()
+    index.rebuild([("linus", "user", "linus", "linus"), ("linux", "post", 1, "Linux")])
+
+    assert index.lookup("lin", kinds=("post",)) == [("post", 1, "Linux")]
+
+
+def test_add_many_and_remove():
+    index = _index("GPU chips")
+    index.add_many([("Rust in the kernel", "post", 7, "Rust in the kernel"),
+                    ("the kernel", "post", 7, "Rust in the kernel"),
+                    ("kernel", "post", 7, "Rust in the kernel")])
+    index.add("linus", "user", "linus", "linus")
+
+    assert len(index) == 2 + 3 + 1
+    assert index.lookup("the") == [("post", 7, "Rust in the kernel")]
+    keys = index._snapshot[0]
+    assert keys == sorted(keys)
+
+    index.remove("post", 7)
+    assert index.lookup("kernel") == []
+    assert index.lookup("gpu") == [("post", 1, "GPU chips")]
+    index.remove("post", 99)   # unknown: no-op
+    assert len(index) == 3
+
+
+def test_add_respects_the_byte_budget():
+    index = PrefixIndex(max_bytes=2 * (_ENTRY_OVERHEAD + 10))
+    index.rebuild([("a", "post", 1, "a")])
+    index.add_many([("b", "post", 2, "b"), ("c", "post", 2, "b"), ("d", "post", 2, "b")])
+
+    assert len(index) == 1
+
+
+def test_budget_keeps_categories_and_users_and_drops_oldest_posts(app):
+    with app.app_context():
+        db.session.add(Category(name="Linux", slug="linux", post_count=0))
+        db.session.add(User(username="linus", email="linus@example.com", password_hash="x"))
+        db.session.commit()
+        db.session.add_all([Post(title=f"lin{i:02d}", summary="s", user_id=1) for i in range(20)])
+        db.session.commit()
+
+        entry = _ENTRY_OVERHEAD + len("lin00")
+        index = PrefixIndex(max_bytes=2 * entry + 5 * entry)
+        index.rebuild(build_entries())
+
+    kinds = [kind for kind, _, _ in index.lookup("lin", limit=50)]
+    assert kinds.count("category") == 1
+    assert kinds.count("user") == 1
+    posts = sorted(label for kind, _, label in index.lookup("lin", limit=50) if kind == "post")
+    assert posts == [f"lin{i:02d}" for i in range(15, 20)]
+
+
+@pytest.fixture
+def populated(app):
+    with app.app_context():
+        db.session.add(Category(name="Linux", slug="linux", post_count=0))
+        user = User(username="linus", email="linus@example.com", password_hash="x")
+        db.session.add(user)
+        db.session.commit()
+        db.session.add(Post(title="Linux kernel release", summary="s", user_id=user.id))
+        db.session.commit()
+        rebuild_suggest_index()
+        user_id = user.id
+    yield user_id
+    suggest_index.rebuild([])
+
+
+def test_suggest_endpoint_for_anonymous_visitors(client, populated):
+    assert client.get("/api/suggest?q=lin").get_json() == [
+        {"kind": "category", "label": "Linux", "url": "/category/linux"},
+        {"kind": "post", "label": "Linux kernel release", "url": "/post/1"},
+    ]
+    assert client.get("/api/suggest").get_json() == []
+
+
+def test_suggest_endpoint_includes_users_when_logged_in(client, populated):
+    login(client, populated)
+
+    results = client.get("/api/suggest?q=lin").get_json()
+
+    assert {"kind": "user", "label": "linus", "url": "/profile/linus"} in results
+    assert len(results) == 3
@@ -0,0 +1,143 @@
+import json
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app import create_app, db
+from app.models import Like, Post, PostVector, TrendingStory, User
+from app.transfer import STATE_FILE, export_tables, import_tables
+
+TABLES = ["user", "post", "like", "trending_story", "post_vector"]
+
+
+@pytest.fixture
+def target(monkeypatch):
+    """
+    A second app on its own empty in-memory database.
+    """
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    other = create_app(start_scheduler=False)
+    with other.app_context():
+        db.create_all()
+    return other
+
+
+@pytest.fixture
+def exported(app, tmp_path):
+    with app.app_context():
+        users = [User(username=f"user{i}", email=f"user{i}@example.com", password_hash="x")
+                 for i in range(3)]
+        db.session.add_all(users)
+        db.session.commit()
+        posted = datetime(2025, 3, 4, 5, 6, 7, 890123)
+        posts = [Post(title=f"post {i}", summary="s", content="ünïcode ✓", user_id=users[i % 3].id,
+                      date_posted=posted) for i in range(7)]
+        db.session.add_all(posts)
+        db.session.commit()
+        db.session.add_all([Like(user_id=u.id, post_id=p.id, created_at=posted)
+                            for u in users for p in posts[:3]])
+        db.session.add_all([TrendingStory(title=f"story {i}", description="d",
+                                          source_url=f"https://example.com/{i}", date_posted=posted)
+                            for i in range(5)])
+        db.session.add_all([PostVector(post_id=p.id, indices=np.arange(p.id, dtype=np.int32).tobytes(),
+                                       weights=np.full(p.id, 0.5, dtype=np.float32).tobytes(),
+                                       norm=1.5, updated_at=posted) for p in posts])
+        db.session.commit()
+
+        counts = export_tables(str(tmp_path), TABLES, batch_size=2)
+
+    assert counts == {"user": 3, "post": 7, "like": 9, "trending_story": 5, "post_vector": 7}
+    return tmp_path
+
+
+def _snapshot():
+    return {
+        "user": [(u.id, u.username) for u in User.query.order_by(User.id)],
+        "post": [(p.id, p.title, p.content, p.user_id, p.date_posted) for p in Post.query.order_by(Post.id)],
+        "like": [(l.user_id, l.post_id, l.created_at) for l in Like.query.order_by(Like.id)],
+        "trending_story": [(s.id, s.source_url, s.date_posted) for s in TrendingStory.query.order_by(TrendingStory.id)],
+        "post_vector": [(v.post_id, bytes(v.indices), bytes(v.weights), v.norm, v.updated_at)
+                        for v in PostVector.query.order_by(PostVector.post_id)],
+    }
+
+
+def test_round_trip_preserves_datetimes_and_binary(app, target, exported):
+    with app.app_context():
+        expected = _snapshot()
+
+    with target.app_context():
+        inserted = import_tables(str(exported), batch_size=2)
+        assert inserted == {name: len(rows) for name, rows in expected.items()}
+        assert _snapshot() == expected
+        vector = db.session.get(PostVector, 3)
+        assert np.frombuffer(vector.weights, dtype=np.float32).tolist() == [0.5, 0.5, 0.5]
+
+
+def test_import_refuses_non_empty_tables(target, exported):
+    with target.app_context():
+        db.session.add(User(username="existing", email="existing@example.com", password_hash="x"))
+        db.session.commit()
+
+        with pytest.raises(RuntimeError, match="user is not empty"):
+            import_tables(str(exported))
+        assert Post.query.count() == 0
+
+
+def _rewind_state(directory, table, rows):
+    path = directory / STATE_FILE
+    state = json.loads(path.read_text())
+    state[table] -= rows
+    path.write_text(json.dumps(state))
+
+
+def test_resume_after_a_lagging_checkpoint(app, target, exported):
+    with app.app_context():
+        expected = _snapshot()
+
+    with target.app_context():
+        import_tables(str(exported), batch_size=2)
+        # crash between a batch's commit and its checkpoint
+        _rewind_state(exported, "trending_story", 2)
+        _rewind_state(exported, "like", 3)
+
+        inserted = import_tables(str(exported), batch_size=2, resume=True)
+
+        assert set(inserted.values()) == {0}
+        assert _snapshot() == expected
+
+
+def test_resume_without_a_state_file_fills_in_missing_rows(app, target, exported):
+    with app.app_context():
+        expected = _snapshot()
+
+    with target.app_context():
+        import_tables(str(exported), batch_size=2)
+        (exported / STATE_FILE).unlink()
+        Like.query.filter(Like.id > 4).delete()
+        PostVector.query.filter(PostVector.post_id > 5).delete()
+        db.session.commit()
+
+        inserted = import_tables(str(exported), batch_size=2, resume=True)
+
+        assert inserted["like"] == 5
+        assert inserted["post_vector"] == 2
+        assert _snapshot() == expected
+
+
+def test_cli_round_trip(app, target, tmp_path):
+    with app.app_context():
+        db.session.add(User(username="cli", email="cli@example.com", password_hash="x"))
+        db.session.commit()
+
+    out = tmp_path / "backup"
+    result = app.test_cli_runner().invoke(args=["export-data", str(out), "--table", "user"])
+    assert result.exit_code == 0, result.output
+
+    result = target.test_cli_runner().invoke(args=["import-data", str(out)])
+    assert result.exit_code == 0, result.output
+    assert "Imported 1 rows into 1 tables" in result.output
+
+    result = target.test_cli_runner().invoke(args=["import-data", str(out)])
+    assert result.exit_code != 0
+    assert "not empty" in result.output